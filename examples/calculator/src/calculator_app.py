@@ -3,25 +3,43 @@ Calculator App
 Main application window with UI components and event handling.
 """
 
+import os
+
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QGridLayout, QPushButton, QLineEdit, QComboBox,
                             QLabel, QFrame)
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 
-from calculator_engine import CalculatorEngine
+from calculator_engine import CalculatorEngine, ConcurrentCalculatorEngine
+from warm_start import load_snapshot, save_snapshot
+
+# How often the warm-start snapshot is refreshed while running (ms)
+SNAPSHOT_INTERVAL_MS = 60000
 
 
 class CalculatorApp(QMainWindow):
     """Main calculator application window."""
     
-    def __init__(self):
-        """Initialize the calculator application."""
+    def __init__(self, snapshot_path=None):
+        """
+        Initialize the calculator application.
+        
+        With snapshot_path, results and history are restored from the
+        warm-start snapshot there and saved back periodically and on close.
+        """
         super().__init__()
         
         # Initialize core components
-        self.engine = CalculatorEngine()
+        self.snapshot_path = snapshot_path
         self.history_items = []  # Simple in-memory history (max 10 items)
+        self.snapshot = None
+        if snapshot_path:
+            self.snapshot = load_snapshot(snapshot_path, CalculatorEngine())
+            self.engine = ConcurrentCalculatorEngine(warm_start=self.snapshot)
+            self.history_items = self.snapshot.history[:10]
+        else:
+            self.engine = CalculatorEngine()
         
         # UI state
         self.current_expression = ""
@@ -36,6 +54,12 @@ class CalculatorApp(QMainWindow):
         self.calc_timer.setSingleShot(True)
         self.calc_timer.timeout.connect(self.update_result)
         
+        # Periodically persist the warm-start snapshot
+        if snapshot_path:
+            self.snapshot_timer = QTimer()
+            self.snapshot_timer.timeout.connect(self.save_snapshot)
+            self.snapshot_timer.start(SNAPSHOT_INTERVAL_MS)
+        
         # Initialize display
         self.reset_calculator()
     
@@ -365,6 +389,26 @@ class CalculatorApp(QMainWindow):
             self.input_field.setText(selected_item['expression'])
             self.input_field.setFocus()
     
+    def save_snapshot(self):
+        """Write hot results and history to the warm-start snapshot, if enabled."""
+        if not self.snapshot_path:
+            return
+        results = self.engine.cached_results()
+        # Windows cannot replace a mapped file; elsewhere lookups keep using the old map
+        if os.name == "nt":
+            self.snapshot.close()
+        try:
+            save_snapshot(self.snapshot_path, self.engine, results, self.history_items)
+        except OSError as e:
+            print(f"Error saving snapshot: {e}")
+        finally:
+            self.snapshot.reopen()
+    
+    def closeEvent(self, event):
+        """Save the warm-start snapshot before closing."""
+        self.save_snapshot()
+        super().closeEvent(event)
+    
     def keyPressEvent(self, event):
         """Handle keyboard input."""
         try:
@@ -1,19 +1,72 @@
 """
 Calculator Engine
 Simple and safe calculation logic using sanitized eval.
+
+Thread safety: after construction an engine only holds its configuration, and
+evaluation keeps all state in locals, so one CalculatorEngine may be shared by
+any number of threads as long as nobody reassigns its settings.
+ConcurrentCalculatorEngine makes that guarantee explicit (read-only settings)
+and adds a striped result cache whose hits take no lock.
 """
 
+import math
 import re
-from typing import Union
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from evaluation_result import ErrorCode, EvaluationResult
+from linear_evaluator import evaluate_linear
+from result_formatter import DEFAULT_MAX_LENGTH, DEFAULT_SCI_THRESHOLD, format_result
+
+# Precompiled patterns shared (read-only) by all engines and threads
+_ALLOWED_CHARACTERS = re.compile(r'[0-9+\-*/.() ]*')
+_WHITESPACE = re.compile(r'\s+')
+_REPEATED_OPERATORS = re.compile(r'[+*/]{2,}')
+_REPEATED_MINUS = re.compile(r'[-]{3,}')
+_DIGIT_PAREN = re.compile(r'(\d)\(')
+_PAREN_DIGIT = re.compile(r'\)(\d)')
+_PAREN_PAREN = re.compile(r'\)\(')
+
+# Nesting eval's parser handles safely (it fails at about 200 levels)
+_MAX_EVAL_DEPTH = 100
+
+# Bump whenever formatted results change, so persisted results are not reused
+RESULT_FORMAT_VERSION = 2
+
+
+def _nesting_depth(expression: str) -> int:
+    """Return the deepest parenthesis nesting in expression."""
+    depth = deepest = 0
+    for char in expression:
+        if char == '(':
+            depth += 1
+            if depth > deepest:
+                deepest = depth
+        elif char == ')':
+            depth -= 1
+    return deepest
 
 
 class CalculatorEngine:
     """Simple calculator engine with safe expression evaluation."""
     
-    def __init__(self):
-        """Initialize calculator engine."""
-        self.max_decimal_places = 8
-        self.min_representable = 1e-8
+    def __init__(self, max_decimal_places: int = 8, min_representable: float = 1e-8,
+                 large_input_threshold: int = 10000, sci_threshold: float = DEFAULT_SCI_THRESHOLD,
+                 max_result_length: int = DEFAULT_MAX_LENGTH):
+        """
+        Initialize calculator engine.
+        
+        Expressions longer than large_input_threshold characters, or nested
+        too deeply for eval's parser, are evaluated by linear_evaluator
+        (linear time, no recursion) instead of eval.
+        Results at or above sci_threshold are shown in scientific notation, and
+        no result is longer than max_result_length characters.
+        """
+        self.max_decimal_places = max_decimal_places
+        self.min_representable = min_representable
+        self.large_input_threshold = large_input_threshold
+        self.sci_threshold = sci_threshold
+        self.max_result_length = max_result_length
     
     def is_valid_input_character(self, char: str) -> bool:
         """Check if character is allowed in calculator input."""
@@ -25,66 +78,83 @@ class CalculatorEngine:
             return False
             
         # Check for allowed characters only
-        if not all(self.is_valid_input_character(char) for char in expression):
+        if not _ALLOWED_CHARACTERS.fullmatch(expression):
             return False
         
         # Check for balanced parentheses
         return expression.count('(') == expression.count(')')
     
-    def evaluate_expression(self, expression: str) -> Union[float, str]:
-        """Safely evaluate mathematical expression."""
-        if not expression or not expression.strip():
-            return "?"
+    def evaluate(self, expression: str) -> EvaluationResult:
+        """
+        Safely evaluate mathematical expression into a result record.
         
-        clean_expr = expression.strip()
-        
-        if not self.validate_expression(clean_expr):
-            return "?"
+        The record carries the numeric value and an ErrorCode; its display
+        text is only formatted if read.
+        """
+        clean_expr = expression.strip() if expression else ""
+        if not clean_expr:
+            return EvaluationResult(None, ErrorCode.EMPTY, self)
+        if not _ALLOWED_CHARACTERS.fullmatch(clean_expr):
+            return EvaluationResult(None, ErrorCode.INVALID_CHARACTER, self)
+        open_count = clean_expr.count('(')
+        if open_count != clean_expr.count(')'):
+            return EvaluationResult(None, ErrorCode.UNBALANCED_PARENTHESES, self)
         
         try:
-            # Sanitize expression - only allow safe mathematical operations
-            clean_expr = self._sanitize_expression(clean_expr)
-            
-            # Evaluate safely
-            result = eval(clean_expr, {"__builtins__": {}}, {})
-            
-            # Handle special cases
-            if isinstance(result, (int, float)):
-                if abs(result) < self.min_representable and result != 0:
-                    return "Too Small"
+            if (len(clean_expr) > self.large_input_threshold
+                    or (open_count > _MAX_EVAL_DEPTH and _nesting_depth(clean_expr) > _MAX_EVAL_DEPTH)):
+                result = evaluate_linear(clean_expr)
+            else:
+                # Sanitize expression - only allow safe mathematical operations
+                clean_expr = self._sanitize_expression(clean_expr)
                 
-                # Format result
-                if isinstance(result, float):
-                    formatted = f"{result:.{self.max_decimal_places}f}".rstrip('0').rstrip('.')
-                    if '.' not in formatted and abs(result) < 1e15:
-                        return str(int(result))
-                    return formatted
-                else:
-                    return str(result)
-            
-            return str(result)
-            
-        except (SyntaxError, ValueError, TypeError, ZeroDivisionError, OverflowError):
-            return "?"
+                # Evaluate safely; long operator chains can still exhaust the compiler
+                try:
+                    result = eval(clean_expr, {"__builtins__": {}}, {})
+                except (RecursionError, MemoryError):
+                    result = evaluate_linear(clean_expr)
+        except ZeroDivisionError:
+            return EvaluationResult(None, ErrorCode.DIVISION_BY_ZERO, self)
+        except OverflowError:
+            return EvaluationResult(None, ErrorCode.OVERFLOW, self)
         except Exception:
-            return "?"
+            return EvaluationResult(None, ErrorCode.INVALID_SYNTAX, self)
+        
+        # Anything but a number (e.g. the empty tuple from "()") is not a result
+        if type(result) not in (int, float):
+            return EvaluationResult(None, ErrorCode.INVALID_SYNTAX, self)
+        # Float literals and products beyond the float range evaluate to inf (or nan)
+        if type(result) is float and not math.isfinite(result):
+            return EvaluationResult(None, ErrorCode.OVERFLOW, self)
+        if result != 0 and abs(result) < self.min_representable:
+            return EvaluationResult(result, ErrorCode.TOO_SMALL, self)
+        return EvaluationResult(result, ErrorCode.OK, self)
+    
+    def evaluate_expression(self, expression: str) -> str:
+        """Safely evaluate mathematical expression into display text ("?" on error)."""
+        return self.evaluate(expression).text
+    
+    def format_result(self, result: Union[int, float]) -> str:
+        """Format a numeric result for display ("Too Small" below the precision limit)."""
+        return format_result(result, self.max_decimal_places, self.min_representable,
+                             self.sci_threshold, self.max_result_length)
     
     def _sanitize_expression(self, expression: str) -> str:
         """Sanitize expression to prevent code injection while allowing math."""
         # Remove spaces
-        clean = re.sub(r'\s+', '', expression)
+        clean = _WHITESPACE.sub('', expression)
         
         # Check for invalid sequences
-        if re.search(r'[+*/]{2,}', clean) or re.search(r'[-]{3,}', clean):
+        if _REPEATED_OPERATORS.search(clean) or _REPEATED_MINUS.search(clean):
             raise ValueError("Invalid operator sequence")
         
         # Replace display operators with Python operators
         clean = clean.replace('×', '*').replace('÷', '/')
         
         # Handle implicit multiplication (e.g., 2(3) -> 2*(3))
-        clean = re.sub(r'(\d)\(', r'\1*(', clean)
-        clean = re.sub(r'\)(\d)', r')*\1', clean)
-        clean = re.sub(r'\)\(', r')*(', clean)
+        clean = _DIGIT_PAREN.sub(r'\1*(', clean)
+        clean = _PAREN_DIGIT.sub(r')*\1', clean)
+        clean = _PAREN_PAREN.sub(r')*(', clean)
         
         return clean
     
@@ -108,4 +178,105 @@ class CalculatorEngine:
             if not current_number or current_number[-1] in operators:
                 return current_input + '0.'
         
-        return current_input + new_char
\ No newline at end of file
+        return current_input + new_char
+
+
+class ResultCache:
+    """
+    Bounded expression -> result cache split into independently locked stripes.
+    
+    Lookups take no lock (a single dict read is atomic, including on
+    free-threaded builds where dicts lock internally); inserts lock only the
+    key's stripe, so writers on different stripes never contend. Each stripe
+    evicts its oldest entry when full.
+    """
+    
+    def __init__(self, max_entries: int = 4096, stripes: int = 16):
+        """Initialize an empty cache."""
+        self._stripes = tuple({} for _ in range(stripes))
+        self._locks = tuple(threading.Lock() for _ in range(stripes))
+        self._stripe_capacity = max(1, max_entries // stripes)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for key, or None."""
+        return self._stripes[hash(key) % len(self._stripes)].get(key)
+    
+    def put(self, key: str, value: Any) -> None:
+        """Cache value for key, evicting the stripe's oldest entry if full."""
+        index = hash(key) % len(self._stripes)
+        stripe = self._stripes[index]
+        with self._locks[index]:
+            if key not in stripe and len(stripe) >= self._stripe_capacity:
+                stripe.pop(next(iter(stripe)))
+            stripe[key] = value
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        """Return a snapshot of all (key, value) pairs, oldest first per stripe."""
+        pairs = []
+        for index, stripe in enumerate(self._stripes):
+            with self._locks[index]:
+                pairs.extend(stripe.items())
+        return pairs
+    
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return sum(len(stripe) for stripe in self._stripes)
+
+
+class ConcurrentCalculatorEngine(CalculatorEngine):
+    """
+    Calculator engine for sharing across threads.
+    
+    Settings are fixed at construction (assigning them raises AttributeError),
+    and results are memoized in a ResultCache, so the hot path of a repeated
+    expression is one lock-free dict lookup. An optional warm_start snapshot
+    (see warm_start.load_snapshot) is consulted on cache misses, so results
+    from earlier sessions are reused instead of recomputed.
+    
+    The cache holds EvaluationResult records, plus display strings taken from
+    the snapshot; evaluate() replaces such a string with a full record.
+    """
+    
+    def __init__(self, max_decimal_places: int = 8, min_representable: float = 1e-8,
+                 cache_size: int = 4096, cache_stripes: int = 16, warm_start=None,
+                 large_input_threshold: int = 10000, sci_threshold: float = DEFAULT_SCI_THRESHOLD,
+                 max_result_length: int = DEFAULT_MAX_LENGTH):
+        """Initialize the engine with immutable settings and an empty cache."""
+        super().__init__(max_decimal_places, min_representable, large_input_threshold,
+                         sci_threshold, max_result_length)
+        self._cache = ResultCache(cache_size, cache_stripes)
+        self._warm_start = warm_start
+        self._frozen = True
+    
+    def __setattr__(self, name, value):
+        """Reject changes to settings once constructed."""
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"{type(self).__name__} settings are read-only")
+        super().__setattr__(name, value)
+    
+    def evaluate(self, expression: str) -> EvaluationResult:
+        """Safely evaluate mathematical expression into a result record, reusing cached records."""
+        cached = self._cache.get(expression)
+        if isinstance(cached, EvaluationResult):
+            return cached
+        result = super().evaluate(expression)
+        self._cache.put(expression, result)
+        return result
+    
+    def evaluate_expression(self, expression: str) -> str:
+        """Safely evaluate mathematical expression into display text, reusing cached results."""
+        cached = self._cache.get(expression)
+        if cached is not None:
+            return cached if isinstance(cached, str) else cached.text
+        text = self._warm_start.get(expression) if self._warm_start is not None else None
+        if text is None:
+            return self.evaluate(expression).text
+        self._cache.put(expression, text)
+        return text
+    
+    def cached_results(self) -> Dict[str, str]:
+        """Return the results worth persisting: warm-start entries, then this session's cache."""
+        results = dict(self._warm_start.items()) if self._warm_start is not None else {}
+        for expression, cached in self._cache.items():
+            results[expression] = cached if isinstance(cached, str) else cached.text
+        return results
@@ -0,0 +1,60 @@
+"""
+Evaluation Result
+Lightweight result record returned by CalculatorEngine.evaluate().
+
+High-volume callers read the numeric value and error code directly and never
+pay for formatting; the display text ("42", "?", "Too Small") is computed
+only when .text is first read, then kept.
+"""
+
+from enum import Enum
+from typing import Optional, Union
+
+
+class ErrorCode(Enum):
+    """Why an evaluation has no displayable numeric result."""
+    OK = 0
+    EMPTY = 1
+    INVALID_CHARACTER = 2
+    UNBALANCED_PARENTHESES = 3
+    INVALID_SYNTAX = 4
+    DIVISION_BY_ZERO = 5
+    OVERFLOW = 6
+    TOO_SMALL = 7
+
+
+class EvaluationResult:
+    """
+    Numeric value and error code of one evaluation.
+
+    value is None when the error prevented a result; for TOO_SMALL it holds
+    the (non-zero) value that was too small to display.
+    """
+
+    __slots__ = ('value', 'error', '_engine', '_text')
+
+    def __init__(self, value: Optional[Union[int, float]], error: ErrorCode, engine):
+        """Initialize the record; engine formats the text on demand."""
+        self.value = value
+        self.error = error
+        self._engine = engine
+        self._text: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the value is a displayable result."""
+        return self.error is ErrorCode.OK
+
+    @property
+    def text(self) -> str:
+        """Display text, as returned by evaluate_expression."""
+        if self._text is None:
+            if self.error is ErrorCode.OK or self.error is ErrorCode.TOO_SMALL:
+                self._text = self._engine.format_result(self.value)
+            else:
+                self._text = "?"
+        return self._text
+
+    def __repr__(self) -> str:
+        """Show the value and error code."""
+        return f"EvaluationResult(value={self.value!r}, error={self.error.name})"
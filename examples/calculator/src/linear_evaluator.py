@@ -0,0 +1,159 @@
+"""
+Linear Evaluator
+Single-pass, non-recursive evaluation for very long or deeply nested expressions.
+
+Python's eval builds a full syntax tree and compiles it recursively, so
+machine-generated input hundreds of KB long, or nested beyond the parser's
+limit (about 200 levels), fails with recursion/parser errors or takes
+superlinear time. This evaluator streams tokens from one regex scan into a
+shunting-yard loop with explicit operand/operator stacks:
+
+- time is O(n) in the expression length
+- memory is the input plus stacks bounded by the nesting depth
+- no recursion, so depth is limited only by memory
+
+It accepts exactly the engine's syntax (same sanitization rules, implicit
+multiplication after a digit or ')', no leading zeros in integers) and uses
+Python's own arithmetic, so results match eval. The deliberate differences:
+
+- integers are kept exact only below 2**64 and continue in floating point
+  beyond that, because arbitrary-precision arithmetic on ever-growing
+  integers cannot run in linear time
+- a value that is no longer finite (a huge literal, or a product beyond
+  the float range) raises OverflowError instead of becoming inf
+- arithmetic runs while the input is still being read, so an arithmetic
+  error is reported before a later syntax error: "7/0+" raises
+  ZeroDivisionError where eval reports invalid syntax
+"""
+
+import math
+import operator
+import re
+from typing import List, Union
+
+_WHITESPACE = re.compile(r'\s+')
+_REPEATED_OPERATORS = re.compile(r'[+*/]{2,}')
+_REPEATED_MINUS = re.compile(r'[-]{3,}')
+
+# A number literal, or any single other character (validated in the loop)
+_TOKEN = re.compile(r'(\d+\.?\d*|\.\d+)|(.)', re.DOTALL)
+
+# Integers at or beyond this magnitude continue as floats
+INT_LIMIT = 2 ** 64
+
+# Literals this long could exceed INT_LIMIT and are parsed as floats
+_MAX_INT_DIGITS = 19
+
+# Unary operators are applied as soon as their operand is complete
+_BINARY = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, 'neg': 3, 'pos': 3, '(': 0}
+
+Number = Union[int, float]
+
+
+def _parse_number(literal: str) -> Number:
+    """Convert a number literal, rejecting leading zeros like Python does."""
+    if '.' in literal:
+        return _limit(float(literal))
+    if literal[0] == '0' and literal.strip('0'):
+        raise ValueError("Leading zeros in integer literal")
+    if len(literal) > _MAX_INT_DIGITS:
+        return _limit(float(literal))
+    return _limit(int(literal))
+
+
+def _limit(value: Number) -> Number:
+    """Switch an integer to floating point once it reaches INT_LIMIT; reject inf and nan."""
+    if type(value) is int:
+        if -INT_LIMIT < value < INT_LIMIT:
+            return value
+        value = float(value)
+    if not math.isfinite(value):
+        raise OverflowError("Result out of floating point range")
+    return value
+
+
+def _reduce(operators: List[str], operands: List[Number], precedence: int) -> None:
+    """Apply stacked operators until the top one binds less tightly than precedence."""
+    while operators and _PRECEDENCE[operators[-1]] >= precedence:
+        name = operators.pop()
+        if name == 'neg':
+            operands[-1] = _limit(-operands[-1])
+        elif name != 'pos':
+            right = operands.pop()
+            operands[-1] = _limit(_BINARY[name](operands[-1], right))
+
+
+def evaluate_linear(expression: str) -> Number:
+    """
+    Evaluate an expression in linear time.
+
+    Raises ValueError for invalid syntax, ZeroDivisionError, and
+    OverflowError once a value leaves the float range.
+    """
+    clean = _WHITESPACE.sub('', expression)
+    if not clean:
+        raise ValueError("Empty expression")
+    if _REPEATED_OPERATORS.search(clean) or _REPEATED_MINUS.search(clean):
+        raise ValueError("Invalid operator sequence")
+
+    operands: List[Number] = []
+    operators: List[str] = []
+    expect_operand = True
+    # Whether the previous token allows implicit multiplication before "("
+    after_close = False
+    after_digit = False
+
+    for match in _TOKEN.finditer(clean):
+        literal = match.group(1)
+        if literal is not None:
+            if not expect_operand:
+                # ")2" means ")*2"; ").5" is an error as in eval
+                if not after_close or literal[0] == '.':
+                    raise ValueError("Missing operator")
+                _reduce(operators, operands, 2)
+                operators.append('*')
+            operands.append(_parse_number(literal))
+            expect_operand = after_close = False
+            after_digit = literal[-1] != '.'
+            continue
+
+        char = match.group(2)
+        if char in _BINARY:
+            if not expect_operand:
+                _reduce(operators, operands, _PRECEDENCE[char])
+                operators.append(char)
+                expect_operand = True
+            elif char == '-':
+                operators.append('neg')
+            elif char == '+':
+                operators.append('pos')
+            else:
+                raise ValueError("Missing operand")
+        elif char == '(':
+            if not expect_operand:
+                # "2(3)" and ")(" multiply; "2.(3)" is an error as in eval
+                if not (after_close or after_digit):
+                    raise ValueError("Missing operator")
+                _reduce(operators, operands, 2)
+                operators.append('*')
+            operators.append('(')
+            expect_operand = True
+        elif char == ')':
+            if expect_operand:
+                raise ValueError("Missing operand")
+            _reduce(operators, operands, 1)
+            if not operators:
+                raise ValueError("Unbalanced parentheses")
+            operators.pop()
+            after_close = True
+            after_digit = False
+        else:
+            raise ValueError(f"Invalid character: {char!r}")
+
+    if expect_operand:
+        raise ValueError("Missing operand")
+    _reduce(operators, operands, 1)
+    if operators:
+        raise ValueError("Unbalanced parentheses")
+    return operands[0]
@@ -4,22 +4,41 @@ Calculator Application
 Professional calculator with real-time calculation and history.
 """
 
+import argparse
 import sys
 from PyQt6.QtWidgets import QApplication
 from calculator_app import CalculatorApp
+from session_recorder import SessionRecorder
+
+
+def parse_args(argv):
+    """Parse calculator options; remaining arguments are left for Qt."""
+    parser = argparse.ArgumentParser(description="Professional Calculator")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record this editing session (keys, clicks, timings) to PATH")
+    parser.add_argument("--snapshot", metavar="PATH",
+                        help="restore results and history from PATH and save them back on exit")
+    return parser.parse_known_args(argv)
 
 
 def main():
     """Run the calculator application."""
+    args, qt_args = parse_args(sys.argv[1:])
+    
     # Create application
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Professional Calculator")
     app.setApplicationVersion("1.0")
     
     # Create and show calculator window
-    calculator = CalculatorApp()
+    calculator = CalculatorApp(snapshot_path=args.snapshot)
     calculator.show()
     
+    # Optionally record the session for latency replay
+    if args.record:
+        recorder = SessionRecorder(calculator, args.record)
+        app.aboutToQuit.connect(recorder.close)
+    
     # Run application
     sys.exit(app.exec())
 
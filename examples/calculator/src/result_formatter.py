@@ -0,0 +1,144 @@
+"""
+Result Formatter
+Shortest round-trip, bounded-length formatting of calculation results.
+
+- Below sci_threshold, results are shown in fixed point, rounded to
+  max_decimal_places and then printed with the fewest digits that read back
+  as the same float (so 0.1 + 0.2 shows 0.3, and large values show no
+  binary noise digits).
+- At or above sci_threshold, floats and integers switch to scientific
+  notation with at most 17 significant digits (1e+300, not 301 digits).
+  Big integers are scaled with bit_length and integer division, never
+  fully converted with str().
+- No result is longer than max_length: digits are rounded away until it
+  fits, preferring fixed point while every integer digit still fits.
+"""
+
+import math
+from typing import Tuple, Union
+
+DEFAULT_SCI_THRESHOLD = 1e15
+DEFAULT_MAX_LENGTH = 24
+
+# Significant digits that identify any float exactly
+_FLOAT_DIGITS = 17
+
+# Decimals with at most this many digits survive a round trip through float
+_EXACT_DIGITS = 15
+
+# Integers up to this size convert to float exactly enough for display
+_MAX_FLOAT_BITS = 1000
+
+_LOG10_2 = math.log10(2)
+
+# (negative, significant digits without trailing zeros, decimal exponent of the first digit)
+Decomposed = Tuple[bool, str, int]
+
+
+def _decompose_float(value: float) -> Decomposed:
+    """Split a finite float into its shortest round-trip digits and exponent."""
+    text = repr(abs(value))
+    mantissa, _, exponent = text.partition('e')
+    integer, _, fraction = mantissa.partition('.')
+    digits = integer + fraction
+    stripped = digits.lstrip('0')
+    exponent = int(exponent or 0) + len(integer) - 1 - (len(digits) - len(stripped))
+    return value < 0, stripped.rstrip('0') or '0', exponent
+
+
+def _decompose_int(value: int) -> Decomposed:
+    """Split an integer into at most 17 significant digits and an exponent, without str()."""
+    magnitude = abs(value)
+    if magnitude.bit_length() <= _MAX_FLOAT_BITS:
+        return (value < 0,) + _decompose_float(float(magnitude))[1:]
+
+    # Scale down to 18 digits; the estimate from bit_length is off by at most one
+    shift = int((magnitude.bit_length() - 1) * _LOG10_2) - _FLOAT_DIGITS
+    leading = magnitude // 10 ** shift
+    while leading >= 10 ** (_FLOAT_DIGITS + 1):
+        leading //= 10
+        shift += 1
+    while leading < 10 ** _FLOAT_DIGITS:
+        shift -= 1
+        leading = magnitude // 10 ** shift
+    digits, exponent = _round_digits(str(leading), shift + _FLOAT_DIGITS, _FLOAT_DIGITS)
+    return value < 0, digits, exponent
+
+
+def _round_digits(digits: str, exponent: int, significant: int) -> Tuple[str, int]:
+    """Round a digit string to the given number of significant digits (half up)."""
+    if len(digits) <= significant:
+        return digits, exponent
+    rounded = str(int(digits[:significant]) + (digits[significant] >= '5'))
+    if len(rounded) > significant:
+        exponent += 1
+    return rounded[:significant].rstrip('0') or '0', exponent
+
+
+def _fixed(negative: bool, digits: str, exponent: int) -> str:
+    """Lay out digits in fixed-point notation."""
+    if exponent >= 0:
+        integer = digits[:exponent + 1].ljust(exponent + 1, '0')
+        fraction = digits[exponent + 1:]
+    else:
+        integer = '0'
+        fraction = '0' * (-exponent - 1) + digits
+    text = f"{integer}.{fraction}" if fraction else integer
+    return f"-{text}" if negative else text
+
+
+def _scientific(negative: bool, digits: str, exponent: int) -> str:
+    """Lay out digits in scientific notation, e.g. 1.5e+20."""
+    mantissa = f"{digits[0]}.{digits[1:]}" if len(digits) > 1 else digits
+    text = f"{mantissa}e{exponent:+d}"
+    return f"-{text}" if negative else text
+
+
+def _fit(negative: bool, digits: str, exponent: int, fixed: bool, max_length: int) -> str:
+    """Drop significant digits until the result fits in max_length ("?" if it never does)."""
+    for significant in range(len(digits), 0, -1):
+        rounded, rounded_exponent = _round_digits(digits, exponent, significant)
+        # Fixed point only while no integer digit is rounded away
+        if fixed and significant > rounded_exponent:
+            text = _fixed(negative, rounded, rounded_exponent)
+            if len(text) <= max_length:
+                return text
+        text = _scientific(negative, rounded, rounded_exponent)
+        if len(text) <= max_length:
+            return text
+    return "?"
+
+
+def format_result(value: Union[int, float], max_decimal_places: int = 8,
+                  min_representable: float = 1e-8, sci_threshold: float = DEFAULT_SCI_THRESHOLD,
+                  max_length: int = DEFAULT_MAX_LENGTH) -> str:
+    """Format a numeric result for display ("Too Small" below min_representable)."""
+    magnitude = abs(value)
+    if magnitude < min_representable and value != 0:
+        return "Too Small"
+
+    if magnitude < sci_threshold:
+        if type(value) is float:
+            text = f"{value:.{max_decimal_places}f}"
+            if len(text) - (text[0] == '-') > _EXACT_DIGITS + 1:
+                # Too many digits to be exact: print the shortest round trip instead
+                text = repr(round(value, max_decimal_places))
+                if 'e' in text:
+                    text = _fixed(*_decompose_float(float(text)))
+            if '.' in text:
+                text = text.rstrip('0').rstrip('.')
+            if text == '-0':
+                text = '0'
+        else:
+            text = str(value)
+        if len(text) <= max_length:
+            return text
+        return _fit(*_decompose_float(float(text)), fixed=True, max_length=max_length)
+
+    if isinstance(value, float) and not math.isfinite(value):
+        return repr(value)
+    decomposed = _decompose_int(value) if isinstance(value, int) else _decompose_float(value)
+    text = _scientific(*decomposed)
+    if len(text) <= max_length:
+        return text
+    return _fit(*decomposed, fixed=False, max_length=max_length)
@@ -0,0 +1,98 @@
+"""
+Session Recorder
+Captures a CalculatorApp editing session (key presses, button clicks, timings) to a file.
+
+Sessions are JSON Lines: a header line followed by one event per line, with
+``t`` in milliseconds since recording started:
+
+    {"format": "calculator-session", "version": 1}
+    {"t": 0.0, "type": "key", "key": 50, "text": "2", "modifiers": 0}
+    {"t": 412.7, "type": "click", "button": "+"}
+
+Recorded sessions are replayed headlessly by test/bench/replay_session.py to
+measure keystroke-to-result latency.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from PyQt6.QtCore import QEvent, QObject
+
+SESSION_FORMAT = "calculator-session"
+SESSION_VERSION = 1
+
+
+class SessionRecorder(QObject):
+    """Records the input events of a CalculatorApp until close() is called."""
+
+    def __init__(self, calculator, path):
+        """Start recording events of calculator; they are written to path on close()."""
+        super().__init__(calculator)
+        self.path = Path(path)
+        self.events: List[Dict] = []
+        self._start = time.perf_counter()
+        self._window = calculator
+        self._input_field = calculator.input_field
+        # Last key seen by the input field; if the field ignores it, it reaches the window next
+        self._field_event = None
+
+        # Keys usually arrive at the input field; the window sees the rest
+        calculator.input_field.installEventFilter(self)
+        calculator.installEventFilter(self)
+        for text, button in calculator.buttons.items():
+            button.clicked.connect(lambda checked, t=text: self._record({"type": "click", "button": t}))
+
+    def _record(self, event: Dict) -> None:
+        """Append an event stamped with the elapsed time."""
+        event["t"] = round((time.perf_counter() - self._start) * 1000, 3)
+        self.events.append(event)
+
+    def _record_key(self, event) -> None:
+        """Append a key press."""
+        self._record({
+            "type": "key",
+            "key": event.key(),
+            "text": event.text(),
+            "modifiers": event.modifiers().value,
+        })
+
+    def eventFilter(self, obj, event):
+        """Record key presses without consuming them."""
+        if event.type() == QEvent.Type.KeyPress:
+            if obj is self._input_field:
+                self._field_event = event
+                self._record_key(event)
+            elif obj is self._window:
+                # A key ignored by the input field propagates here: it was recorded already
+                if event is not self._field_event:
+                    self._record_key(event)
+                self._field_event = None
+        return False
+
+    def close(self) -> None:
+        """Write the recorded session to disk."""
+        save_session(self.path, self.events)
+
+
+def save_session(path, events: List[Dict]) -> None:
+    """Write a session file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(json.dumps({"format": SESSION_FORMAT, "version": SESSION_VERSION}) + "\n")
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def load_session(path) -> List[Dict]:
+    """Read a session file; raises ValueError if it is not a supported session."""
+    with open(path, 'r') as f:
+        lines = [line for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty session file: {path}")
+    header = json.loads(lines[0])
+    if header.get("format") != SESSION_FORMAT or header.get("version") != SESSION_VERSION:
+        raise ValueError(f"Unsupported session file: {path}")
+    return [json.loads(line) for line in lines[1:]]
@@ -0,0 +1,182 @@
+"""
+Vector Evaluator
+Compile parametric expressions once and evaluate them over whole NumPy arrays.
+
+A parametric expression is a calculator expression with named placeholders,
+e.g. ``(x + 3) * 2 / y``. It is validated with the engine's rules (allowed
+characters, balanced parentheses, operator sequences, implicit
+multiplication), parsed once into a tree of NumPy operations, and then
+evaluated element-wise over arrays or any Python buffer (array.array,
+memoryview, lists). Arithmetic is float64 throughout.
+
+Per-element errors are reported as masks instead of exceptions: an element is
+invalid ("?") when any division on its path divides by zero or its result is
+not finite, and "Too Small" when its result is non-zero but below the
+engine's min_representable.
+"""
+
+import ast
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from calculator_engine import CalculatorEngine
+
+# Placeholder names are letters/underscores only, so "x2" is never ambiguous
+_PLACEHOLDER = re.compile(r'[A-Za-z_]+')
+_ALLOWED = re.compile(r'[0-9A-Za-z_+\-*/.() ]*')
+_WHITESPACE = re.compile(r'\s+')
+_REPEATED_OPERATORS = re.compile(r'[+*/]{2,}')
+_REPEATED_MINUS = re.compile(r'[-]{3,}')
+
+# Implicit multiplication, extended to placeholders: 2(x), 2x, x(y), )x, )(
+_IMPLICIT_MULTIPLICATION = (
+    (re.compile(r'(\d)(?=[A-Za-z_(])'), r'\1*'),
+    (re.compile(r'([A-Za-z_])(?=\()'), r'\1*'),
+    (re.compile(r'\)(?=[\dA-Za-z_(])'), r')*'),
+)
+
+_BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+}
+
+# A compiled node: (placeholder arrays, error mask to update) -> values
+Node = Callable[[Dict[str, np.ndarray], np.ndarray], np.ndarray]
+
+
+class VectorResult:
+    """Element-wise results of a ParametricExpression evaluation."""
+
+    def __init__(self, values: np.ndarray, invalid: np.ndarray, too_small: np.ndarray,
+                 engine: CalculatorEngine):
+        """Initialize the result; invalid elements hold NaN in values."""
+        self.values = values
+        self.invalid = invalid
+        self.too_small = too_small
+        self._engine = engine
+
+    @property
+    def ok(self) -> np.ndarray:
+        """Mask of elements with a displayable numeric result."""
+        return ~(self.invalid | self.too_small)
+
+    def to_strings(self) -> List[str]:
+        """Format every element as the string API would ("?" / "Too Small" / number)."""
+        strings = []
+        for value, invalid, too_small in zip(self.values.ravel().tolist(), self.invalid.ravel().tolist(),
+                                             self.too_small.ravel().tolist()):
+            if invalid:
+                strings.append("?")
+            elif too_small:
+                strings.append("Too Small")
+            else:
+                strings.append(self._engine.format_result(value))
+        return strings
+
+
+class ParametricExpression:
+    """A validated expression with placeholders, compiled for vectorized evaluation."""
+
+    def __init__(self, expression: str, engine: Optional[CalculatorEngine] = None):
+        """Validate and compile expression; raises ValueError if it is invalid."""
+        self.expression = expression
+        self.engine = engine or CalculatorEngine()
+        placeholders = set()
+        self._root = self._compile(self._parse(expression), placeholders)
+        self.variables: Tuple[str, ...] = tuple(sorted(placeholders))
+
+    def _parse(self, expression: str) -> ast.AST:
+        """Apply the engine's validation and sanitization rules, then parse."""
+        if not expression or not expression.strip():
+            raise ValueError("Empty expression")
+        if not _ALLOWED.fullmatch(expression):
+            raise ValueError("Invalid character in expression")
+        if expression.count('(') != expression.count(')'):
+            raise ValueError("Unbalanced parentheses")
+
+        clean = _WHITESPACE.sub('', expression)
+        if _REPEATED_OPERATORS.search(clean) or _REPEATED_MINUS.search(clean):
+            raise ValueError("Invalid operator sequence")
+        for pattern, replacement in _IMPLICIT_MULTIPLICATION:
+            clean = pattern.sub(replacement, clean)
+
+        try:
+            return ast.parse(clean, mode='eval').body
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression: {e.msg}") from None
+
+    def _compile(self, node: ast.AST, placeholders: set) -> Node:
+        """Turn the syntax tree into nested NumPy operations."""
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            try:
+                value = np.float64(node.value)
+            except OverflowError:
+                # An integer literal beyond float64: every result using it is invalid
+                value = np.float64(np.inf)
+            return lambda env, invalid: value
+
+        if isinstance(node, ast.Name):
+            if not _PLACEHOLDER.fullmatch(node.id):
+                raise ValueError(f"Invalid placeholder name: {node.id}")
+            name = node.id
+            placeholders.add(name)
+            return lambda env, invalid: env[name]
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self._compile(node.operand, placeholders)
+            if isinstance(node.op, ast.USub):
+                return lambda env, invalid: np.negative(operand(env, invalid))
+            return operand
+
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Div):
+            left = self._compile(node.left, placeholders)
+            right = self._compile(node.right, placeholders)
+
+            def divide(env, invalid):
+                numerator = left(env, invalid)
+                denominator = right(env, invalid)
+                np.logical_or(invalid, denominator == 0, out=invalid)
+                return np.divide(numerator, denominator)
+            return divide
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            ufunc = _BINARY_OPERATORS[type(node.op)]
+            left = self._compile(node.left, placeholders)
+            right = self._compile(node.right, placeholders)
+            return lambda env, invalid: ufunc(left(env, invalid), right(env, invalid))
+
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+    def evaluate(self, **inputs) -> VectorResult:
+        """
+        Evaluate over arrays (or buffers/scalars) given per placeholder name.
+
+        Inputs are broadcast against each other, NumPy-style.
+        """
+        missing = set(self.variables) - set(inputs)
+        unknown = set(inputs) - set(self.variables)
+        if missing or unknown:
+            raise ValueError(f"Expected inputs {list(self.variables)}, "
+                             f"missing {sorted(missing)}, unknown {sorted(unknown)}")
+
+        env = {name: np.asarray(value, dtype=np.float64) for name, value in inputs.items()}
+        shape = np.broadcast_shapes(*(array.shape for array in env.values()))
+        invalid = np.zeros(shape, dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            values = np.broadcast_to(self._root(env, invalid), shape).astype(np.float64, copy=True)
+
+        np.logical_or(invalid, ~np.isfinite(values), out=invalid)
+        values[invalid] = np.nan
+        magnitude = np.abs(values)
+        too_small = ~invalid & (magnitude < self.engine.min_representable) & (values != 0)
+        return VectorResult(values, invalid, too_small, self.engine)
+
+
+def compile_expression(expression: str,
+                       engine: Optional[CalculatorEngine] = None) -> ParametricExpression:
+    """Compile a parametric expression once for repeated vectorized evaluation."""
+    return ParametricExpression(expression, engine)
@@ -0,0 +1,281 @@
+"""
+Warm Start
+Versioned, memory-mapped snapshots of hot evaluation results and calculation history.
+
+A snapshot lets a new process (the GUI or a headless worker) start with the
+results and history of earlier sessions instead of an empty engine. The file
+is mapped with mmap and read on demand: opening it only validates the
+header, and each lookup binary-searches a sorted index and checks the CRC-32
+of the one result it returns, so start-up cost does not grow with the
+snapshot size.
+
+File layout (little-endian):
+
+    header   magic "CALCWARM", format version, engine fingerprint,
+             entry count, offsets of the index, string data and history,
+             and the CRC-32 of the history
+    index    entry count x (crc32 of key, key offset, key length,
+             value offset, value length, crc32 of value), sorted by key crc32
+    data     UTF-8 expression and result strings
+    history  UTF-8 JSON list of {"expression", "result"} items
+
+A snapshot whose magic, version or engine fingerprint (result format and
+settings) does not match is ignored, never trusted: the caller gets an empty
+snapshot with a status explaining why, and simply starts cold. Damage found
+later, when a result or the history is read, turns the snapshot "corrupt"
+and empty from then on.
+
+Lookups are safe from any number of threads, also while reopen() swaps in a
+newly saved file.
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from calculator_engine import RESULT_FORMAT_VERSION, CalculatorEngine
+
+MAGIC = b"CALCWARM"
+FORMAT_VERSION = 3
+
+_HEADER = struct.Struct("<8sHHIIIIIII")
+_ENTRY = struct.Struct("<IIIIII")
+
+# Results kept per snapshot; the hottest (most recently cached) win
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def engine_fingerprint(engine: CalculatorEngine) -> int:
+    """Identify the result format and settings a snapshot's results depend on."""
+    key = (f"{RESULT_FORMAT_VERSION}|{engine.max_decimal_places}|{engine.min_representable!r}"
+           f"|{engine.large_input_threshold}|{engine.sci_threshold!r}|{engine.max_result_length}")
+    return zlib.crc32(key.encode())
+
+
+class _Mapping:
+    """A mapped snapshot file and the header fields needed to read it."""
+
+    __slots__ = ('map', 'count', 'index_offset', 'history_offset', 'history_length', 'history_crc')
+
+    def __init__(self, mapped: mmap.mmap, count: int, index_offset: int,
+                 history_offset: int, history_length: int, history_crc: int):
+        """Initialize the mapping."""
+        self.map = mapped
+        self.count = count
+        self.index_offset = index_offset
+        self.history_offset = history_offset
+        self.history_length = history_length
+        self.history_crc = history_crc
+
+    def entry(self, position: int) -> Tuple[int, int, int, int, int, int]:
+        """Read the index entry at position."""
+        return _ENTRY.unpack_from(self.map, self.index_offset + position * _ENTRY.size)
+
+
+class _Damaged(Exception):
+    """A checksum did not match the data read from the snapshot."""
+
+
+def _checked_string(data: bytes, crc: int) -> str:
+    """Decode UTF-8 data after checking its CRC-32."""
+    if zlib.crc32(data) != crc:
+        raise _Damaged()
+    return data.decode('utf-8')
+
+
+class WarmStartSnapshot:
+    """Read-only, lazily loaded view of a snapshot file."""
+
+    def __init__(self, path, engine: CalculatorEngine):
+        """Map the snapshot at path; check status before relying on its contents."""
+        self.path = Path(path)
+        self._fingerprint = engine_fingerprint(engine)
+        self._history: Optional[List[Dict]] = None
+        self.status, self._mapping = self._open()
+
+    def _open(self) -> Tuple[str, Optional[_Mapping]]:
+        """Map the file and validate its header; return (status, mapping or None)."""
+        try:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < _HEADER.size:
+                    return "corrupt", None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return "missing", None
+        except (OSError, ValueError):
+            return "corrupt", None
+
+        (magic, version, _, file_fingerprint, count, index_offset,
+         _, history_offset, history_length, history_crc) = _HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            status = "corrupt"
+        elif version != FORMAT_VERSION:
+            status = "incompatible version"
+        elif file_fingerprint != self._fingerprint:
+            status = "incompatible engine"
+        elif (index_offset + count * _ENTRY.size > size
+              or history_offset + history_length > size):
+            status = "corrupt"
+        else:
+            return "loaded", _Mapping(mapped, count, index_offset,
+                                      history_offset, history_length, history_crc)
+        mapped.close()
+        return status, None
+
+    def _damaged(self, mapping: _Mapping) -> None:
+        """Stop serving a mapping whose contents failed a checksum."""
+        if self._mapping is mapping:
+            self._mapping = None
+            self.status = "corrupt"
+
+    @property
+    def loaded(self) -> bool:
+        """True if the snapshot was valid and its contents are available."""
+        return self._mapping is not None
+
+    def __len__(self) -> int:
+        """Return the number of stored results."""
+        mapping = self._mapping
+        return mapping.count if mapping is not None else 0
+
+    def get(self, expression: str) -> Optional[str]:
+        """Return the stored result for expression, or None."""
+        # One read of the mapping: reopen() may swap it concurrently
+        mapping = self._mapping
+        if mapping is None:
+            return None
+        key = expression.encode('utf-8')
+        key_hash = zlib.crc32(key)
+
+        try:
+            # Binary search for the first entry with this hash
+            low, high = 0, mapping.count
+            while low < high:
+                middle = (low + high) // 2
+                if mapping.entry(middle)[0] < key_hash:
+                    low = middle + 1
+                else:
+                    high = middle
+            for position in range(low, mapping.count):
+                entry_hash, key_offset, key_length, value_offset, value_length, value_crc = \
+                    mapping.entry(position)
+                if entry_hash != key_hash:
+                    break
+                if mapping.map[key_offset:key_offset + key_length] == key:
+                    return _checked_string(mapping.map[value_offset:value_offset + value_length], value_crc)
+        except _Damaged:
+            self._damaged(mapping)
+        except ValueError:
+            # Unmapped by close() meanwhile: a miss
+            pass
+        return None
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Iterate over all stored (expression, result) pairs, stopping at damaged data."""
+        mapping = self._mapping
+        if mapping is None:
+            return
+        try:
+            for position in range(mapping.count):
+                key_hash, key_offset, key_length, value_offset, value_length, value_crc = \
+                    mapping.entry(position)
+                key = _checked_string(mapping.map[key_offset:key_offset + key_length], key_hash)
+                yield key, _checked_string(mapping.map[value_offset:value_offset + value_length], value_crc)
+        except _Damaged:
+            self._damaged(mapping)
+        except ValueError:
+            return
+
+    @property
+    def history(self) -> List[Dict]:
+        """Saved calculation history (parsed on first access)."""
+        if self._history is None:
+            history = []
+            mapping = self._mapping
+            if mapping is not None and mapping.history_length:
+                start = mapping.history_offset
+                try:
+                    history = json.loads(_checked_string(
+                        mapping.map[start:start + mapping.history_length], mapping.history_crc))
+                except _Damaged:
+                    self._damaged(mapping)
+                except ValueError:
+                    history = []
+            self._history = history
+        return list(self._history)
+
+    def close(self) -> None:
+        """Unmap the file; the snapshot is empty until reopen()."""
+        mapping, self._mapping = self._mapping, None
+        if mapping is not None:
+            mapping.map.close()
+
+    def reopen(self) -> None:
+        """
+        Map the file again, e.g. after a new snapshot replaced it.
+
+        The new mapping is swapped in with one assignment, so concurrent
+        lookups see either the old or the new file. An old mapping that was
+        not close()d is released once no lookup uses it.
+        """
+        status, mapping = self._open()
+        self._history = None
+        self._mapping = mapping
+        self.status = status
+
+
+def load_snapshot(path, engine: CalculatorEngine) -> WarmStartSnapshot:
+    """Open a snapshot for engine; an unusable file yields an empty snapshot."""
+    return WarmStartSnapshot(path, engine)
+
+
+def save_snapshot(path, engine: CalculatorEngine, results: Dict[str, str],
+                  history: List[Dict] = (), max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+    """
+    Atomically write results and history as a snapshot for engine.
+
+    Elsewhere a WarmStartSnapshot of path keeps reading the old file until
+    reopen(); on Windows a mapped file cannot be replaced, so close() it
+    first.
+
+    When results exceed max_entries, the entries iterated last (the most
+    recently cached) are kept.
+    """
+    items = list(results.items())[-max_entries:]
+    encoded = sorted(
+        ((zlib.crc32(key.encode('utf-8')), key.encode('utf-8'), value.encode('utf-8'))
+         for key, value in items),
+        key=lambda entry: entry[0]
+    )
+
+    index_offset = _HEADER.size
+    data_offset = index_offset + len(encoded) * _ENTRY.size
+    index = bytearray()
+    data = bytearray()
+    for key_hash, key, value in encoded:
+        key_offset = data_offset + len(data)
+        data += key
+        value_offset = data_offset + len(data)
+        data += value
+        index += _ENTRY.pack(key_hash, key_offset, len(key), value_offset, len(value), zlib.crc32(value))
+
+    history_bytes = json.dumps(list(history)).encode('utf-8')
+    history_offset = data_offset + len(data)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, engine_fingerprint(engine), len(encoded),
+                          index_offset, data_offset, history_offset, len(history_bytes),
+                          zlib.crc32(history_bytes))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(index)
+        f.write(data)
+        f.write(history_bytes)
+    os.replace(temp_path, path)
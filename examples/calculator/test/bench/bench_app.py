@@ -0,0 +1,55 @@
+"""
+Calculator App Benchmarks
+Window construction and result update latency (runs under the offscreen Qt platform).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import shared_runner  # noqa: E402,F401  (makes the shared bench harness importable)
+
+from harness import measure  # noqa: E402
+
+_app = None
+
+
+def _application():
+    """Return the QApplication, creating an offscreen one if needed."""
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        return None
+    _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
+
+
+def bench_app_startup():
+    """Construct the main window (the PRD start-up budget, minus interpreter start)."""
+    if _application() is None:
+        return None
+    from calculator_app import CalculatorApp
+    return measure(CalculatorApp, repeat=20, warmup=2)
+
+
+def bench_result_update():
+    """Recalculate and display a result, excluding the 100 ms debounce."""
+    if _application() is None:
+        return None
+    from calculator_app import CalculatorApp
+    calculator = CalculatorApp()
+    calculator.input_field.setText("(2 + 3) * 4 / 7")
+    return measure(calculator.update_result, number=20)
+
+
+def bench_keystroke_to_result():
+    """Replay the sample editing session; latency includes the 100 ms debounce."""
+    if _application() is None:
+        return None
+    from replay_session import SAMPLE_SESSION, replay_file
+    return replay_file(SAMPLE_SESSION)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Engine Concurrency Benchmark
+Evaluation throughput across thread counts for per-thread, shared and concurrent engines.
+
+Usage: python test/bench/bench_concurrency.py [--threads 1 2 4 8] [--evaluations N]
+
+On free-threaded CPython builds (python3.13t and later) threads run in
+parallel and throughput should scale with cores; with the GIL it stays flat.
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from calculator_engine import CalculatorEngine, ConcurrentCalculatorEngine  # noqa: E402
+
+DISTINCT_EXPRESSIONS = 500
+
+
+def make_workload(count, seed=7):
+    """Expressions drawn from a fixed pool, so some repeat as in real traffic."""
+    rng = random.Random(seed)
+    pool = [
+        f"({rng.randint(1, 999)} + {rng.randint(1, 99)}.{rng.randint(0, 99)}) * "
+        f"{rng.randint(1, 50)} / {rng.randint(1, 9)} - {rng.randint(0, 500)}"
+        for _ in range(DISTINCT_EXPRESSIONS)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def throughput(mode, threads, workload):
+    """Evaluations per second for one engine mode and thread count."""
+    chunks = [workload[i::threads] for i in range(threads)]
+    shared = {"shared": CalculatorEngine, "concurrent": ConcurrentCalculatorEngine}.get(mode)
+    shared_engine = shared() if shared else None
+    local = threading.local()
+
+    def work(chunk):
+        engine = shared_engine
+        if engine is None:
+            engine = getattr(local, "engine", None) or CalculatorEngine()
+            local.engine = engine
+        for expression in chunk:
+            engine.evaluate_expression(expression)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        list(pool.map(work, chunks))
+        elapsed = time.perf_counter() - start
+    return len(workload) / elapsed
+
+
+def bench_concurrent_engine_throughput():
+    """Shared ConcurrentCalculatorEngine driven by 4 threads."""
+    return {"ops_per_sec": throughput("concurrent", 4, make_workload(20000))}
+
+
+def main():
+    """Print a throughput table across thread counts."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--evaluations", type=int, default=50000)
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled (free-threaded)'}")
+    print(f"{args.evaluations} evaluations of {DISTINCT_EXPRESSIONS} distinct expressions\n")
+
+    workload = make_workload(args.evaluations)
+    modes = ("per-thread", "shared", "concurrent")
+    print(f"{'threads':>7} " + " ".join(f"{mode + ' eval/s':>18}" for mode in modes))
+    for threads in args.threads:
+        rates = [throughput(mode, threads, workload) for mode in modes]
+        print(f"{threads:>7} " + " ".join(f"{rate:>18,.0f}" for rate in rates))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Calculator Engine Benchmarks
+Latency of expression evaluation, checked against the PRD performance budgets.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import shared_runner  # noqa: E402,F401  (makes the shared bench harness importable)
+
+from calculator_engine import CalculatorEngine  # noqa: E402
+
+from harness import measure  # noqa: E402
+
+
+def bench_evaluate_simple():
+    """Evaluate a short expression, as typed in the GUI."""
+    engine = CalculatorEngine()
+    return measure(lambda: engine.evaluate_expression("2 + 3 * 4"), number=100)
+
+
+def bench_evaluate_max_length():
+    """Evaluate a 60-character expression (the GUI input limit)."""
+    engine = CalculatorEngine()
+    expression = "((12.5 + 3) * 4 - 7 / 2) * (1.25 + 2.75) / (9 - 3) + 100 - 1"
+    return measure(lambda: engine.evaluate_expression(expression), number=100)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Result Formatter Benchmark
+Formatting time and output length across magnitudes: previous fixed-point formatting vs result_formatter.
+
+Usage: python test/bench/bench_formatter.py [--repeat N]
+
+The previous formatter printed every float with max_decimal_places fixed
+decimals and every integer in full, so its cost and output grow with the
+magnitude (1e300 gives 301 digits; integers over 4300 digits fail).
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from result_formatter import format_result  # noqa: E402
+
+CASES = [
+    ("float 1/3", 1 / 3),
+    ("float 1e-5", 1.234e-5),
+    ("float 1e6", 1234567.891),
+    ("float 1e14", 1.2345678901234e14),
+    ("float 1e20", 1.5e20),
+    ("float 1e100", 2.5e100),
+    ("float 1e300", 1.7e300),
+    ("int 1e12", 10 ** 12 + 7),
+    ("int 1e30", 10 ** 30 + 7),
+    ("int 1e300", 10 ** 300 + 7),
+    ("int 1e4000", 10 ** 4000 + 7),
+    ("int 1e100000", 10 ** 100000 + 7),
+]
+
+
+def legacy_format_result(result, max_decimal_places=8, min_representable=1e-8):
+    """The fixed-point formatting used before result_formatter."""
+    if abs(result) < min_representable and result != 0:
+        return "Too Small"
+    if isinstance(result, float):
+        formatted = f"{result:.{max_decimal_places}f}".rstrip('0').rstrip('.')
+        if '.' not in formatted and abs(result) < 1e15:
+            return str(int(result))
+        return formatted
+    return str(result)
+
+
+def time_per_call_us(func, value, repeat):
+    """Best-of-5 microseconds per call, or None if func raises."""
+    try:
+        func(value)
+    except ValueError:
+        return None
+    return min(timeit.repeat(lambda: func(value), number=repeat, repeat=5)) / repeat * 1e6
+
+
+def bench_format_result():
+    """Formatting a mix of ordinary and large magnitudes."""
+    values = [value for _, value in CASES]
+    repeat = 200
+    seconds = min(timeit.repeat(lambda: [format_result(v) for v in values], number=repeat, repeat=5))
+    return {"mean_ms": seconds / repeat / len(values) * 1000}
+
+
+def main():
+    """Print timings and output lengths for each magnitude."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'value':>14} {'previous (us)':>14} {'chars':>7} {'new (us)':>9} {'chars':>6}  output")
+    for label, value in CASES:
+        repeat = args.repeat if not isinstance(value, int) or value < 10 ** 1000 else max(1, args.repeat // 100)
+        legacy_us = time_per_call_us(legacy_format_result, value, repeat)
+        new_us = time_per_call_us(format_result, value, repeat)
+        if legacy_us is None:
+            legacy = f"{'error':>14} {'-':>7}"
+        else:
+            legacy = f"{legacy_us:>14.2f} {len(legacy_format_result(value)):>7}"
+        text = format_result(value)
+        print(f"{label:>14} {legacy} {new_us:>9.2f} {len(text):>6}  {text}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Large Input Benchmark
+Evaluation time and peak memory for long and deeply nested expressions, eval vs linear mode.
+
+Usage: python test/bench/bench_large_input.py [--max-mb 10] [--max-depth 100000]
+
+Lengths grow by 10x up to --max-mb and nesting by 10x up to --max-depth;
+time per character should stay flat in linear mode. The eval column uses an
+engine with large-input mode disabled and shows "?" where eval gives up.
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from calculator_engine import CalculatorEngine  # noqa: E402
+
+
+def long_expression(length):
+    """A flat sum/product chain of about length characters."""
+    unit = "12.5*3-7/2+"
+    return unit * (length // len(unit)) + "1"
+
+
+def nested_expression(depth):
+    """depth levels of parentheses with implicit multiplication, e.g. 2(2(2(1)))."""
+    return "2(" * depth + "1" + ")" * depth
+
+
+def measure(engine, expression):
+    """Return (result, milliseconds) for one evaluation."""
+    start = time.perf_counter()
+    result = engine.evaluate_expression(expression)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def peak_memory_mb(engine, expression):
+    """Peak MB allocated by one evaluation (a separate run, as tracing is slow)."""
+    tracemalloc.start()
+    engine.evaluate_expression(expression)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def bench_large_input():
+    """Linear-mode evaluation of a 1 MB expression."""
+    expression = long_expression(10**6)
+    _, elapsed = measure(CalculatorEngine(), expression)
+    return {"mean_ms": elapsed, "chars_per_sec": len(expression) / elapsed * 1000}
+
+
+def report(title, cases, max_eval_length):
+    """Print one table of eval vs linear results."""
+    linear = CalculatorEngine(large_input_threshold=0)
+    legacy = CalculatorEngine(large_input_threshold=sys.maxsize)
+    print(title)
+    print(f"{'size':>10} {'chars':>10} {'linear (ms)':>12} {'ns/char':>8} {'peak MB':>8}"
+          f" {'eval (ms)':>10} {'eval result':>12}")
+    for size, expression in cases:
+        _, linear_ms = measure(linear, expression)
+        peak = peak_memory_mb(linear, expression)
+        if len(expression) <= max_eval_length:
+            eval_result, eval_ms = measure(legacy, expression)
+            eval_text = f"{eval_ms:>10.1f} {str(eval_result)[:12]:>12}"
+        else:
+            eval_text = f"{'-':>10} {'(skipped)':>12}"
+        print(f"{size:>10,} {len(expression):>10,} {linear_ms:>12.1f}"
+              f" {linear_ms * 1e6 / len(expression):>8.0f} {peak:>8.1f} {eval_text}")
+    print()
+
+
+def main():
+    """Print scaling tables for expression length and nesting depth."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-mb", type=float, default=10)
+    parser.add_argument("--max-depth", type=int, default=100000)
+    parser.add_argument("--max-eval-length", type=int, default=10**6,
+                        help="skip eval above this length (it is slow and memory hungry)")
+    args = parser.parse_args()
+
+    lengths = []
+    length = 1000
+    while length <= args.max_mb * 10**6:
+        lengths.append(length)
+        length *= 10
+    depths = []
+    depth = 10
+    while depth <= args.max_depth:
+        depths.append(depth)
+        depth *= 10
+
+    report("Expression length", [(n, long_expression(n)) for n in lengths], args.max_eval_length)
+    report("Nesting depth", [(d, nested_expression(d)) for d in depths], args.max_eval_length)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Result API Benchmark
+Batch evaluation cost: string API (plus re-parsing to numbers) vs EvaluationResult records.
+
+Usage: python test/bench/bench_result_api.py [--count N]
+
+The string API formats every result and callers that need numbers parse
+the text back; evaluate() returns the value and error code directly and
+formats nothing unless .text is read. Evaluation itself (eval) dominates
+the end-to-end time, so the result handling step is also timed on its own.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from calculator_engine import CalculatorEngine  # noqa: E402
+
+
+def make_batch(count, seed=5):
+    """Distinct expressions, about 2% of them dividing by zero."""
+    rng = random.Random(seed)
+    return [
+        f"({rng.randint(1, 9999)} + {rng.randint(1, 99)}.{rng.randint(0, 99)}) * {rng.randint(1, 50)}"
+        f" / {rng.choice([0] + [rng.randint(1, 9)] * 49)} - {i}"
+        for i in range(count)
+    ]
+
+
+def strings_to_numbers(engine, batch):
+    """What batch consumers of the string API do: evaluate, then parse the text back."""
+    values = []
+    for expression in batch:
+        text = engine.evaluate_expression(expression)
+        values.append(float(text) if text not in ("?", "Too Small") else None)
+    return values
+
+
+def records(engine, batch):
+    """Read values from result records without formatting."""
+    return [result.value for result in map(engine.evaluate, batch)]
+
+
+def best_seconds(func, engine, batch, repeat=3):
+    """Best wall time of repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(engine, batch)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_evaluate_records():
+    """Per-expression cost of evaluate() records for a 10,000 expression batch."""
+    batch = make_batch(10000)
+    seconds = best_seconds(records, CalculatorEngine(), batch)
+    return {"mean_ms": seconds * 1000 / len(batch), "evaluations_per_sec": len(batch) / seconds}
+
+
+def handling_seconds(engine, batch):
+    """Seconds spent after evaluation: (formatting + float() parsing, reading .value)."""
+    results = [engine.evaluate(expression) for expression in batch]
+    start = time.perf_counter()
+    [float(r.text) if r.text not in ("?", "Too Small") else None for r in results]
+    via_text = time.perf_counter() - start
+    start = time.perf_counter()
+    [r.value for r in results]
+    return via_text, time.perf_counter() - start
+
+
+def main():
+    """Print string API vs record API timings."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=50000)
+    args = parser.parse_args()
+
+    engine = CalculatorEngine()
+    batch = make_batch(args.count)
+    string_seconds = best_seconds(strings_to_numbers, engine, batch)
+    record_seconds = best_seconds(records, engine, batch)
+    via_text, via_value = handling_seconds(engine, batch)
+
+    def per_expression(seconds):
+        return f"{seconds * 1e6 / args.count:7.3f} us/expression"
+
+    print(f"{args.count:,} expressions")
+    print("End to end:")
+    print(f"  string API + float(): {per_expression(string_seconds)}")
+    print(f"  evaluate() records:   {per_expression(record_seconds)}")
+    print("Result handling only:")
+    print(f"  format + float():     {per_expression(via_text)}")
+    print(f"  read .value:          {per_expression(via_value)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
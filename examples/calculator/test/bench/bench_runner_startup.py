@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Runner Start-up Benchmark
+Compares time-to-first-result of a cold pytest subprocess with the warm forking runner.
+
+Usage: python test/bench/bench_runner_startup.py [--repeat N] [pytest selection...]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+TEST_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = TEST_DIR.parent
+sys.path.insert(0, str(TEST_DIR))
+
+import shared_runner  # noqa: E402,F401  (makes the shared runner importable)
+from watch_runner import WarmRunner  # noqa: E402
+
+RESULT_LINE = re.compile(rb" (PASSED|FAILED|ERROR|SKIPPED)")
+
+
+def read_until_first_result(stream, start: float):
+    """Read pytest -v output; return (time to first result, time to end)."""
+    first = None
+    for line in iter(stream.readline, b""):
+        if first is None and RESULT_LINE.search(line):
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def cold_run(selection):
+    """Time a fresh interpreter running pytest."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "pytest", "-v", "-p", "no:cacheprovider", *selection],
+        cwd=PROJECT_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    first, total = read_until_first_result(proc.stdout, start)
+    proc.wait()
+    return first, total
+
+
+def warm_run(runner, selection):
+    """Time a forked child of the preloaded runner."""
+    read_fd, write_fd = os.pipe()
+    start = time.perf_counter()
+    if os.fork() == 0:
+        os.close(read_fd)
+        code = runner.run(["-v", "-p", "no:cacheprovider", *selection], stdout_fd=write_fd)
+        os._exit(code)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as stream:
+        first, total = read_until_first_result(stream, start)
+    os.wait()
+    return first, total
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("selection", nargs="*", default=["test/test_calculator.py"])
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    runner = WarmRunner(PROJECT_DIR)
+    if not runner.can_fork:
+        print("Warm runner needs os.fork(); nothing to compare on this platform")
+        return 1
+
+    preload_start = time.perf_counter()
+    runner.preload()
+    preload_time = time.perf_counter() - preload_start
+
+    results = {"cold": [], "warm": []}
+    for _ in range(args.repeat):
+        results["cold"].append(cold_run(args.selection))
+        results["warm"].append(warm_run(runner, args.selection))
+
+    print(f"Selection: {' '.join(args.selection)}  (repeat={args.repeat})")
+    print(f"One-off warm-up (preload): {preload_time * 1000:.0f} ms\n")
+    print(f"{'path':<6} {'first result (ms)':>18} {'full run (ms)':>14}")
+    for path, samples in results.items():
+        first = statistics.median(s[0] for s in samples if s[0] is not None)
+        total = statistics.median(s[1] for s in samples)
+        print(f"{path:<6} {first * 1000:>18.0f} {total * 1000:>14.0f}")
+    cold_first = statistics.median(s[0] for s in results["cold"])
+    warm_first = statistics.median(s[0] for s in results["warm"])
+    print(f"\nTime-to-first-result speedup: {cold_first / warm_first:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Vectorized Evaluation Benchmark
+Sweeps one formula over 10^3..10^7 inputs: per-string evaluate_expression loop vs compiled NumPy.
+
+Usage: python test/bench/bench_vectorized.py [--max-loop N]
+
+The string loop is timed on at most --max-loop elements and extrapolated
+linearly for larger sizes (it is strictly per-element work).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from calculator_engine import CalculatorEngine  # noqa: E402
+
+FORMULA = "(x + 3) * 2 / y"
+SIZES = (10**3, 10**4, 10**5, 10**6, 10**7)
+
+
+def make_inputs(size, seed=3):
+    """Random inputs; about 1% of y values are zero to exercise the error mask."""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(-1000, 1000, size).round(3)
+    y = rng.integers(-50, 50, size).astype(np.float64)
+    return x, y
+
+
+def time_string_loop(engine, x, y):
+    """Seconds to build and evaluate one expression string per element."""
+    start = time.perf_counter()
+    for xi, yi in zip(x.tolist(), y.tolist()):
+        engine.evaluate_expression(f"({xi} + 3) * 2 / ({yi})")
+    return time.perf_counter() - start
+
+
+def time_vectorized(compiled, x, y):
+    """Seconds for one vectorized evaluation (best of 3)."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        compiled.evaluate(x=x, y=y)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_vectorized_sweep():
+    """Vectorized evaluation of FORMULA over 10^6 elements."""
+    if np is None:
+        return None
+    from vector_evaluator import compile_expression
+    x, y = make_inputs(10**6)
+    seconds = time_vectorized(compile_expression(FORMULA), x, y)
+    return {"mean_ms": seconds * 1000, "elements_per_sec": 10**6 / seconds}
+
+
+def main():
+    """Print loop vs vectorized timings and speedups."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-loop", type=int, default=10**5)
+    args = parser.parse_args()
+    if np is None:
+        print("NumPy is not installed")
+        return 1
+
+    from vector_evaluator import compile_expression
+    engine = CalculatorEngine()
+    compiled = compile_expression(FORMULA, engine)
+
+    print(f"Formula: {FORMULA}")
+    print(f"{'elements':>10} {'string loop (s)':>16} {'vectorized (s)':>15} {'speedup':>9}")
+    per_element = None
+    for size in SIZES:
+        x, y = make_inputs(size)
+        if size <= args.max_loop:
+            loop_seconds = time_string_loop(engine, x, y)
+            per_element = loop_seconds / size
+            note = ""
+        else:
+            loop_seconds = per_element * size
+            note = " (extrapolated)"
+        vector_seconds = time_vectorized(compiled, x, y)
+        print(f"{size:>10,} {loop_seconds:>16.4f} {vector_seconds:>15.5f}"
+              f" {loop_seconds / vector_seconds:>8.0f}x{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Warm Start Benchmark
+Time to warm: cold engine recomputing a workload vs an engine started from a snapshot.
+
+Usage: python test/bench/bench_warm_start.py [--entries N]
+
+Reports the snapshot's write time and size, the time to open it (which
+should stay flat as it grows, since loading is lazy), and the time for a
+fresh engine to answer every workload expression cold vs warm.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from calculator_engine import CalculatorEngine, ConcurrentCalculatorEngine  # noqa: E402
+from warm_start import load_snapshot, save_snapshot  # noqa: E402
+
+
+def make_workload(count, seed=11):
+    """Distinct expressions of the kind typed into the calculator."""
+    rng = random.Random(seed)
+    return [
+        f"({rng.randint(1, 9999)} + {rng.randint(1, 99)}.{rng.randint(0, 99)}) * "
+        f"{rng.randint(1, 50)} / {rng.randint(1, 9)} - {i}"
+        for i in range(count)
+    ]
+
+
+def time_to_warm(engine, workload):
+    """Seconds for engine to produce a result for every expression once."""
+    start = time.perf_counter()
+    for expression in workload:
+        engine.evaluate_expression(expression)
+    return time.perf_counter() - start
+
+
+def measure_warm_start(entries):
+    """Snapshot write/open times and cold vs warm time-to-warm, in milliseconds."""
+    workload = make_workload(entries)
+    engine = CalculatorEngine()
+    results = {expression: engine.evaluate_expression(expression) for expression in workload}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "warm.snap"
+        start = time.perf_counter()
+        save_snapshot(path, engine, results, max_entries=entries)
+        save_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        snapshot = load_snapshot(path, engine)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        cold = time_to_warm(ConcurrentCalculatorEngine(cache_size=entries), workload)
+        warm = time_to_warm(ConcurrentCalculatorEngine(cache_size=entries, warm_start=snapshot), workload)
+        size = path.stat().st_size
+        snapshot.close()
+
+    return {
+        "snapshot_bytes": size,
+        "save_ms": save_ms,
+        "open_ms": open_ms,
+        "cold_ms": cold * 1000,
+        "warm_ms": warm * 1000,
+    }
+
+
+def bench_warm_start():
+    """Time to warm 10,000 expressions from a snapshot."""
+    metrics = measure_warm_start(10000)
+    return {"mean_ms": metrics["warm_ms"], "cold_ms": metrics["cold_ms"], "open_ms": metrics["open_ms"]}
+
+
+def main():
+    """Print cold vs warm time-to-warm for growing snapshots."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'size (KB)':>10} {'save (ms)':>10} {'open (ms)':>10}"
+          f" {'cold (ms)':>10} {'warm (ms)':>10} {'speedup':>8}")
+    for entries in args.entries:
+        m = measure_warm_start(entries)
+        print(f"{entries:>8,} {m['snapshot_bytes'] / 1024:>10.0f} {m['save_ms']:>10.1f} {m['open_ms']:>10.3f}"
+              f" {m['cold_ms']:>10.1f} {m['warm_ms']:>10.1f} {m['cold_ms'] / m['warm_ms']:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
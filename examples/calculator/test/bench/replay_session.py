@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Session Replayer
+Replays a recorded editing session against CalculatorApp under the offscreen Qt platform.
+
+Usage: python test/bench/replay_session.py SESSION.jsonl [--speed 1.0] [--json]
+
+Events are dispatched at their recorded times (scaled by --speed) and the Qt
+event loop runs in between, so the 100 ms calc_timer debounce behaves as it
+does for a real user. For every keystroke or click that changes the
+expression, latency is measured from dispatch until result_field shows the
+result for that expression. The report also counts:
+
+- dropped: expression changes that never got their own result, because a
+  later keystroke restarted the debounce timer first (or the session ended)
+- stale: result updates whose displayed text does not match a fresh
+  evaluation of the expression currently in the input field
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from PyQt6.QtCore import QEvent, Qt  # noqa: E402
+from PyQt6.QtGui import QKeyEvent  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import shared_runner  # noqa: E402,F401  (makes the shared bench harness importable)
+from calculator_app import CalculatorApp  # noqa: E402
+from harness import percentile  # noqa: E402
+from session_recorder import load_session  # noqa: E402
+
+SAMPLE_SESSION = BENCH_DIR / "sessions" / "sample_session.jsonl"
+
+# Time to keep the event loop running after the last event (must exceed the debounce)
+SETTLE_SECONDS = 0.5
+
+
+class SessionReplayer:
+    """Drives a CalculatorApp with recorded events and measures result latency."""
+
+    def __init__(self, calculator: CalculatorApp, speed: float = 1.0):
+        """Attach to calculator; speed > 1 replays faster than recorded."""
+        self.calculator = calculator
+        self.speed = speed
+        self.latencies_ms: List[float] = []
+        self.dropped = 0
+        self.stale = 0
+        self.updates = 0
+        self._pending = []  # (dispatch time, expression) awaiting a result
+
+        # Runs right after update_result, which was connected first
+        calculator.calc_timer.timeout.connect(self._on_result_updated)
+
+    def _on_result_updated(self):
+        """Match the displayed result with the keystrokes waiting for it."""
+        now = time.perf_counter()
+        self.updates += 1
+        expression = self.calculator.input_field.text()
+
+        stripped = expression.strip()
+        expected = self.calculator.engine.evaluate_expression(stripped) if stripped else "0"
+        if self.calculator.result_field.text() != str(expected):
+            self.stale += 1
+
+        if self._pending and self._pending[-1][1] == expression:
+            dispatched, _ = self._pending.pop()
+            self.latencies_ms.append((now - dispatched) * 1000)
+        self.dropped += len(self._pending)
+        self._pending.clear()
+
+    def _dispatch(self, event: Dict) -> None:
+        """Deliver one recorded event to the calculator."""
+        if event["type"] == "key":
+            target = self.calculator.input_field
+            modifiers = Qt.KeyboardModifier(event.get("modifiers", 0))
+            for event_type in (QEvent.Type.KeyPress, QEvent.Type.KeyRelease):
+                QApplication.sendEvent(target, QKeyEvent(event_type, event["key"], modifiers, event["text"]))
+        elif event["type"] == "click":
+            self.calculator.buttons[event["button"]].click()
+
+    def _run_event_loop_until(self, deadline: float) -> None:
+        """Process Qt events (timers included) until the deadline."""
+        app = QApplication.instance()
+        while True:
+            app.processEvents()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.0005))
+
+    def replay(self, events: List[Dict]) -> Dict:
+        """Replay events in real time and return the latency report."""
+        self.calculator.input_field.setFocus()
+        start = time.perf_counter()
+        for event in events:
+            self._run_event_loop_until(start + event["t"] / 1000 / self.speed)
+            before = self.calculator.input_field.text()
+            dispatched = time.perf_counter()
+            self._dispatch(event)
+            after = self.calculator.input_field.text()
+            if after != before:
+                self._pending.append((dispatched, after))
+        self._run_event_loop_until(time.perf_counter() + SETTLE_SECONDS)
+        self.dropped += len(self._pending)
+        self._pending.clear()
+        return self.report(len(events))
+
+    def report(self, event_count: int) -> Dict:
+        """Summarize latencies and update counts."""
+        report = {
+            "events": event_count,
+            "results": len(self.latencies_ms),
+            "updates": self.updates,
+            "dropped": self.dropped,
+            "stale": self.stale,
+        }
+        if self.latencies_ms:
+            for pct in (50, 95, 99):
+                report[f"p{pct}_ms"] = percentile(self.latencies_ms, pct)
+            report["max_ms"] = max(self.latencies_ms)
+        return report
+
+
+def replay_file(path, speed: float = 1.0) -> Dict:
+    """Replay a session file against a fresh CalculatorApp."""
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    calculator = CalculatorApp()
+    try:
+        return SessionReplayer(calculator, speed).replay(load_session(path))
+    finally:
+        calculator.close()
+        app.processEvents()
+
+
+def main():
+    """Replay a session and print the latency report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("session", nargs="?", default=str(SAMPLE_SESSION))
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay speed factor (2 = twice as fast as recorded)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = replay_file(args.session, args.speed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Session: {args.session} (speed {args.speed}x)")
+    print(f"Events: {report['events']}, results shown: {report['results']}, "
+          f"timer updates: {report['updates']}")
+    print(f"Dropped (superseded before a result): {report['dropped']}, stale updates: {report['stale']}")
+    if report["results"]:
+        print("Keystroke-to-result latency: "
+              f"p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms, "
+              f"p99 {report['p99_ms']:.1f} ms, max {report['max_ms']:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,4 +8,7 @@ from pathlib import Path
 # Add src directory to Python path for imports
 test_dir = Path(__file__).parent
 src_dir = test_dir.parent / 'src'
-sys.path.insert(0, str(src_dir))
\ No newline at end of file
+sys.path.insert(0, str(src_dir))
+
+# Make the shared runner modules (impact_map, harness, ...) importable
+import shared_runner  # noqa: E402,F401
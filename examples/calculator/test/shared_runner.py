@@ -0,0 +1,21 @@
+"""
+Shared Runner Setup
+Points this example at the shared test runner in templates/test_runner/.
+
+Generated projects get their own copy of the runner in test/; the example
+runs the framework's copy instead, so runner fixes and its tests stay in one
+place. Importing this module makes run_tests, its plugins and bench/harness.py
+importable and tells them which project to work on.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+TEST_DIR = Path(__file__).resolve().parent
+RUNNER_DIR = TEST_DIR.parents[2] / "templates" / "test_runner"
+
+os.environ.setdefault("RUNNER_PROJECT_DIR", str(TEST_DIR.parent))
+for path in (RUNNER_DIR / "bench", RUNNER_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -4,7 +4,8 @@ Essential tests for calculator functionality.
 """
 
 import pytest
-from src.calculator_engine import CalculatorEngine
+from concurrent.futures import ThreadPoolExecutor
+from src.calculator_engine import CalculatorEngine, ConcurrentCalculatorEngine, ResultCache
 from src.calculator_app import CalculatorApp
 
 
@@ -88,6 +89,248 @@ class TestCalculatorEngine:
         assert not self.engine.validate_expression("")
 
 
+class TestLargeInputEvaluation:
+    """Test cases for linear-time evaluation of large expressions."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.engine = CalculatorEngine()
+        self.linear = CalculatorEngine(large_input_threshold=0)
+    
+    def test_matches_eval_results(self):
+        """Test that linear mode gives the same results and errors as eval."""
+        cases = ["2+3*4", "2(3)", "(2)(3)", "(2)3", "-(2+3)*4", "2--3", "+-5", "2*-3",
+                 "8/2/2", "1/3*3", "00.5", ".5+.5", "7.", "0.1+0.2", "1-1.0",
+                 "5/0", "012", "1..2", "2.5(2)", "2---3", "2++3", "(1+2", "1+2)", ")(", "1 2+3"]
+        for expression in cases:
+            assert self.linear.evaluate_expression(expression) == \
+                self.engine.evaluate_expression(expression), expression
+    
+    def test_deep_nesting(self):
+        """Test nesting far beyond eval's parser limit."""
+        depth = 100000
+        assert self.engine.evaluate_expression("(" * depth + "7" + ")" * depth) == "7"
+        assert self.engine.evaluate_expression("1(" * depth + "3" + ")" * depth) == "3"
+        assert self.engine.evaluate_expression("(" * depth + "7" + ")" * (depth - 1)) == "?"
+    
+    def test_deep_nesting_in_short_expression(self):
+        """Test that deep nesting below large_input_threshold still evaluates."""
+        for depth in (250, 1000, 4000):
+            assert self.engine.evaluate_expression("(" * depth + "7" + ")" * depth) == "7", depth
+        assert self.engine.evaluate_expression("-(" * 1000 + "2" + ")" * 1000) == "2"
+        assert self.engine.evaluate_expression("(" * 1000 + "7/0" + ")" * 1000) == "?"
+        # Operator chains too long for eval's compiler
+        assert self.engine.evaluate_expression("1+" * 4999 + "1") == "5000"
+    
+    def test_long_expression(self):
+        """Test a long flat expression and big literals."""
+        assert self.engine.evaluate_expression("1+" * 200000 + "1") == "200001"
+        assert self.engine.evaluate_expression("2*" * 40 + "1") == "1099511627776"
+        # Integers of 2**64 and beyond continue in floating point
+        from src.linear_evaluator import evaluate_linear
+        assert evaluate_linear("2*" * 63 + "1") == 2 ** 63
+        assert evaluate_linear("2*" * 64 + "1") == 2.0 ** 64
+        assert type(evaluate_linear("2*" * 64 + "1")) is float
+        assert self.linear.evaluate_expression("1" * 20000 + "/0") == "?"
+    
+    def test_overflow(self):
+        """Test that values beyond the float range report OVERFLOW, not inf."""
+        from src.calculator_engine import ErrorCode
+        from src.linear_evaluator import evaluate_linear
+        for expression in ("1" * 20000, "9" * 400 + ".5", "1" + "0" * 300 + "*" + "1" + "0" * 300):
+            with pytest.raises(OverflowError):
+                evaluate_linear(expression)
+            result = self.linear.evaluate(expression)
+            assert (result.error, result.text) == (ErrorCode.OVERFLOW, "?")
+        # Arithmetic errors are reported before later syntax errors
+        with pytest.raises(ZeroDivisionError):
+            evaluate_linear("7/0+")
+    
+    def test_validate_expression(self):
+        """Test character validation on long input."""
+        assert self.engine.validate_expression("(1+2)" * 10000)
+        assert not self.engine.validate_expression("1+2" * 10000 + "x")
+        assert not self.engine.validate_expression("1\t+2")
+
+
+class TestResultFormatter:
+    """Test cases for result formatting."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.engine = CalculatorEngine()
+    
+    def test_shortest_round_trip(self):
+        """Test that results show the fewest digits that identify the value."""
+        assert self.engine.evaluate_expression("0.1 + 0.2") == "0.3"
+        assert self.engine.evaluate_expression("2 / 3") == "0.66666667"
+        assert self.engine.evaluate_expression("123456789012.12345678 * 1") == "123456789012.12346"
+        assert self.engine.evaluate_expression("0.00001234 * 1") == "0.00001234"
+        assert self.engine.evaluate_expression("-0.0") == "0"
+    
+    def test_scientific_notation(self):
+        """Test the switch to scientific notation for large magnitudes."""
+        assert self.engine.evaluate_expression("999999999999999") == "999999999999999"
+        assert self.engine.evaluate_expression("1000000000000000") == "1e+15"
+        assert self.engine.evaluate_expression("1.5 * 10000000000 * 10000000000") == "1.5e+20"
+        assert self.engine.format_result(-2.5e300) == "-2.5e+300"
+        assert self.engine.format_result(7 * 10 ** 5000 + 3) == "7e+5000"
+        assert self.engine.format_result(float("inf")) == "inf"
+        assert CalculatorEngine(sci_threshold=1e6).format_result(1234567.0) == "1.234567e+6"
+    
+    def test_max_length(self):
+        """Test that results are rounded to fit the length cap."""
+        engine = CalculatorEngine(max_result_length=8)
+        assert engine.format_result(1 / 3) == "0.333333"
+        assert engine.format_result(9.99999999) == "10"
+        assert engine.format_result(123456789012345) == "1.23e+14"
+        assert engine.format_result(-1.5e300) == "-2e+300"
+        for value in (2 / 3, 10 ** 400, -123456.789, 1e-7, 2 ** 64):
+            assert len(engine.format_result(value)) <= 8
+
+
+class TestEvaluationResult:
+    """Test cases for the result record API."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.engine = CalculatorEngine()
+    
+    def test_values_and_error_codes(self):
+        """Test that evaluate() reports the numeric value and why it failed."""
+        from src.calculator_engine import ErrorCode
+        
+        cases = {
+            "6 * 7": (42, ErrorCode.OK),
+            "1 / 4": (0.25, ErrorCode.OK),
+            "1 / 1000000000": (1e-9, ErrorCode.TOO_SMALL),
+            "": (None, ErrorCode.EMPTY),
+            "2 + a": (None, ErrorCode.INVALID_CHARACTER),
+            "(2 + 3": (None, ErrorCode.UNBALANCED_PARENTHESES),
+            "2 ++ 3": (None, ErrorCode.INVALID_SYNTAX),
+            "()": (None, ErrorCode.INVALID_SYNTAX),
+            "5 / 0": (None, ErrorCode.DIVISION_BY_ZERO),
+            "(" * 20000 + "1" + ")" * 20000 + "/0": (None, ErrorCode.DIVISION_BY_ZERO),
+            "9" * 400 + ".0": (None, ErrorCode.OVERFLOW),
+            "1" + "0" * 300 + ".0 * 1" + "0" * 300 + ".0": (None, ErrorCode.OVERFLOW),
+        }
+        for expression, (value, error) in cases.items():
+            result = self.engine.evaluate(expression)
+            assert (result.value, result.error) == (value, error), expression
+            assert result.ok == (error is ErrorCode.OK)
+            assert result.text == self.engine.evaluate_expression(expression)
+        assert self.engine.evaluate_expression("9" * 400 + ".0") == "?"
+    
+    def test_record_is_slotted(self):
+        """Test that result records carry no per-instance dict."""
+        result = self.engine.evaluate("2 + 3")
+        assert not hasattr(result, '__dict__')
+        assert result.text == "5"
+        assert repr(result) == "EvaluationResult(value=5, error=OK)"
+    
+    def test_concurrent_engine_caches_records(self, tmp_path):
+        """Test that cached records and warm-start strings serve both APIs."""
+        from src.warm_start import load_snapshot, save_snapshot
+        
+        path = tmp_path / "warm.snap"
+        save_snapshot(path, CalculatorEngine(), {"2+2": "4"})
+        engine = ConcurrentCalculatorEngine(warm_start=load_snapshot(path, CalculatorEngine()))
+        assert engine.evaluate("3*3") is engine.evaluate("3*3")
+        assert engine.evaluate_expression("3*3") == "9"
+        assert engine.evaluate_expression("2+2") == "4"
+        assert engine.evaluate("2+2").value == 4
+        assert engine.cached_results() == {"2+2": "4", "3*3": "9"}
+
+
+class TestConcurrentCalculatorEngine:
+    """Test the thread-safe shared engine."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.engine = ConcurrentCalculatorEngine(cache_size=64, cache_stripes=4)
+        self.reference = CalculatorEngine()
+    
+    def test_matches_base_engine(self):
+        """Test that cached results match the base engine, on first and repeated calls."""
+        expressions = ["2 + 3", "1 / 3", "5 / 0", "0.000000001", "(2 + 3) * 4", "2 ++ 3", ""]
+        for _ in range(2):
+            for expression in expressions:
+                assert self.engine.evaluate_expression(expression) == \
+                    self.reference.evaluate_expression(expression)
+    
+    def test_settings_are_read_only(self):
+        """Test that configuration cannot change after construction."""
+        with pytest.raises(AttributeError):
+            self.engine.max_decimal_places = 2
+        assert self.engine.max_decimal_places == 8
+    
+    def test_cache_is_bounded(self):
+        """Test that the striped cache evicts once full."""
+        cache = ResultCache(max_entries=8, stripes=2)
+        for i in range(100):
+            cache.put(f"{i} + 1", str(i + 1))
+        assert len(cache) <= 8
+        assert cache.get("99 + 1") == "100"
+    
+    def test_shared_across_threads(self):
+        """Test that concurrent evaluation on one engine gives consistent results."""
+        expressions = [f"{i} * 3 + {i % 7}" for i in range(200)] * 5
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(self.engine.evaluate_expression, expressions))
+        
+        assert results == [self.reference.evaluate_expression(e) for e in expressions]
+
+
+class TestVectorEvaluator:
+    """Test vectorized evaluation of parametric expressions."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.np = pytest.importorskip("numpy")
+        from src.vector_evaluator import compile_expression
+        self.compile = compile_expression
+        self.engine = CalculatorEngine()
+    
+    def test_matches_string_api(self):
+        """Test element-wise agreement with evaluate_expression, including error masks."""
+        xs = [1, 2.5, -3, 0, 0.125, 7]
+        ys = [2, 0, 4, 5, 1, -0.5]
+        result = self.compile("(x + 3) * 2 / y").evaluate(x=self.np.array(xs), y=self.np.array(ys))
+        expected = [self.engine.evaluate_expression(f"({x} + 3) * 2 / ({y})") for x, y in zip(xs, ys)]
+        assert result.to_strings() == expected
+        assert result.invalid.tolist() == [False, True, False, False, False, False]
+    
+    def test_masks(self):
+        """Test division-by-zero and "Too Small" masks."""
+        result = self.compile("x / y").evaluate(x=[1, 1, 0, 1], y=[0, 1000000000, 0, 4])
+        assert result.invalid.tolist() == [True, False, True, False]
+        assert result.too_small.tolist() == [False, True, False, False]
+        assert result.ok.tolist() == [False, False, False, True]
+        assert result.values[3] == 0.25
+        
+        # Literals beyond float64 make every result invalid instead of raising
+        result = self.compile("x + " + "9" * 400).evaluate(x=[1, 2])
+        assert result.invalid.tolist() == [True, True]
+        assert result.to_strings() == ["?", "?"]
+    
+    def test_buffers_scalars_and_implicit_multiplication(self):
+        """Test Python buffers, broadcasting scalars and implicit multiplication."""
+        import array
+        compiled = self.compile("2x(y + 1)")
+        assert compiled.variables == ("x", "y")
+        result = compiled.evaluate(x=array.array('d', [1.0, 2.0, 3.0]), y=1)
+        assert result.values.tolist() == [4.0, 8.0, 12.0]
+    
+    def test_invalid_expressions_rejected(self):
+        """Test that the engine's validation rules apply at compile time."""
+        for expression in ["", "x +* 2", "(x + 1", "x ** 2", "x.real", "x2 + 1", "x $ 1"]:
+            with pytest.raises(ValueError):
+                self.compile(expression)
+        with pytest.raises(ValueError):
+            self.compile("x + y").evaluate(x=[1])
+
+
 class TestCalculatorApp:
     """Test calculator application functionality."""
     
@@ -123,4 +366,211 @@ class TestCalculatorApp:
         # Should only keep 10 most recent
         assert len(self.calculator.history_items) == 10
         assert self.calculator.history_items[0]['expression'] == "14 + 1"  # Most recent
-        assert self.calculator.history_items[9]['expression'] == "5 + 1"   # 10th most recent
\ No newline at end of file
+        assert self.calculator.history_items[9]['expression'] == "5 + 1"   # 10th most recent
+
+
+class TestSessionRecording:
+    """Test session recording and headless replay."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        from PyQt6.QtWidgets import QApplication
+        import sys
+        
+        if not QApplication.instance():
+            self.app = QApplication(sys.argv)
+        else:
+            self.app = QApplication.instance()
+        
+        self.calculator = CalculatorApp()
+    
+    def test_record_and_replay(self, tmp_path, monkeypatch):
+        """Test that recorded keys and clicks replay to the same result."""
+        from pathlib import Path
+        from PyQt6.QtCore import QEvent, Qt
+        from PyQt6.QtGui import QKeyEvent
+        from PyQt6.QtWidgets import QApplication
+        from src.session_recorder import SessionRecorder, load_session
+        
+        monkeypatch.syspath_prepend(str(Path(__file__).parent / "bench"))
+        from replay_session import SessionReplayer
+        
+        path = tmp_path / "session.jsonl"
+        recorder = SessionRecorder(self.calculator, path)
+        for char in "12":
+            QApplication.sendEvent(self.calculator.input_field, QKeyEvent(
+                QEvent.Type.KeyPress, ord(char), Qt.KeyboardModifier.NoModifier, char))
+        self.calculator.buttons['+'].click()
+        self.calculator.buttons['3'].click()
+        recorder.close()
+        
+        events = load_session(path)
+        assert [e.get("text", e.get("button")) for e in events] == ["1", "2", "+", "3"]
+        
+        replayed = CalculatorApp()
+        report = SessionReplayer(replayed, speed=10).replay(events)
+        assert replayed.result_field.text() == "15"
+        assert report["results"] + report["dropped"] == 4
+        assert report["stale"] == 0
+    
+    def test_records_repeated_and_propagated_keys(self, tmp_path):
+        """Test that repeated keys are all recorded and propagated keys only once."""
+        from PyQt6.QtCore import QEvent, Qt
+        from PyQt6.QtGui import QKeyEvent
+        from PyQt6.QtWidgets import QApplication
+        from src.session_recorder import SessionRecorder
+        
+        recorder = SessionRecorder(self.calculator, tmp_path / "session.jsonl")
+        # Synthetic events all have timestamp 0
+        for char in "112":
+            QApplication.sendEvent(self.calculator.input_field, QKeyEvent(
+                QEvent.Type.KeyPress, ord(char), Qt.KeyboardModifier.NoModifier, char))
+        # Return is ignored by the input field and propagates to the window
+        for target in (self.calculator.input_field, self.calculator.input_field, self.calculator):
+            QApplication.sendEvent(target, QKeyEvent(
+                QEvent.Type.KeyPress, Qt.Key.Key_Return, Qt.KeyboardModifier.NoModifier, "\r"))
+        assert [e["text"] for e in recorder.events] == ["1", "1", "2", "\r", "\r", "\r"]
+        assert self.calculator.input_field.text() == "112"
+
+
+class TestWarmStartSnapshot:
+    """Test cases for warm-start snapshots."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test that saved results and history are loaded back."""
+        from src.warm_start import load_snapshot, save_snapshot
+        
+        engine = CalculatorEngine()
+        path = tmp_path / "warm.snap"
+        results = {f"{i}+1": str(i + 1) for i in range(500)}
+        history = [{'expression': '2+3', 'result': '5'}]
+        save_snapshot(path, engine, results, history)
+        
+        snapshot = load_snapshot(path, engine)
+        assert snapshot.status == "loaded"
+        assert len(snapshot) == 500
+        assert snapshot.get("41+1") == "42"
+        assert snapshot.get("9999+1") is None
+        assert dict(snapshot.items()) == results
+        assert snapshot.history == history
+        snapshot.close()
+    
+    def test_incompatible_or_damaged_snapshots_are_ignored(self, tmp_path):
+        """Test that missing, corrupt and mismatched files load as empty snapshots."""
+        from src.warm_start import load_snapshot, save_snapshot
+        
+        path = tmp_path / "warm.snap"
+        assert load_snapshot(path, CalculatorEngine()).status == "missing"
+        
+        save_snapshot(path, CalculatorEngine(), {"1+1": "2"})
+        mismatched = load_snapshot(path, CalculatorEngine(max_decimal_places=2))
+        assert mismatched.status == "incompatible engine"
+        assert mismatched.get("1+1") is None
+        
+        data = bytearray(path.read_bytes())
+        data[8] += 1  # format version
+        path.write_bytes(bytes(data))
+        assert load_snapshot(path, CalculatorEngine()).status == "incompatible version"
+        
+        path.write_bytes(b"not a snapshot")
+        assert load_snapshot(path, CalculatorEngine()).status == "corrupt"
+        
+        save_snapshot(path, CalculatorEngine(), {"1+1": "2"})
+        path.write_bytes(path.read_bytes()[:50])
+        truncated = load_snapshot(path, CalculatorEngine())
+        assert truncated.status == "corrupt"
+        assert truncated.history == []
+        
+        # Damaged data fails its checksum when read, instead of failing lookups
+        history = [{"expression": "1+1", "result": "2"}]
+        save_snapshot(path, CalculatorEngine(), {"1+1": "2", "2+2": "4"}, history)
+        data = bytearray(path.read_bytes())
+        data[data.index(b"2", data.index(b"1+1") + 3)] = 0xff
+        path.write_bytes(bytes(data))
+        damaged = load_snapshot(path, CalculatorEngine())
+        assert damaged.status == "loaded"
+        assert damaged.get("1+1") is None
+        assert damaged.status == "corrupt"
+        assert damaged.get("2+2") is None
+        assert list(damaged.items()) == []
+        
+        save_snapshot(path, CalculatorEngine(), {"1+1": "2"}, history)
+        data = bytearray(path.read_bytes())
+        data[data.index(b'"result"')] = ord("'")
+        path.write_bytes(bytes(data))
+        damaged = load_snapshot(path, CalculatorEngine())
+        assert damaged.history == []
+        assert damaged.status == "corrupt"
+    
+    def test_reopen_swaps_mapping_under_concurrent_lookups(self, tmp_path):
+        """Test that lookups from other threads never fail while a save reopens the snapshot."""
+        import threading
+        from src.warm_start import load_snapshot, save_snapshot
+        
+        engine = CalculatorEngine()
+        path = tmp_path / "warm.snap"
+        results = {f"{i}+1": str(i + 1) for i in range(200)}
+        save_snapshot(path, engine, results)
+        snapshot = load_snapshot(path, engine)
+        errors = []
+        stop = threading.Event()
+        
+        def lookups():
+            try:
+                while not stop.is_set():
+                    for i in range(0, 200, 7):
+                        assert snapshot.get(f"{i}+1") == str(i + 1)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=lookups) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(20):
+            save_snapshot(path, engine, results)
+            snapshot.reopen()
+        stop.set()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert snapshot.status == "loaded"
+    
+    def test_engine_reuses_snapshot_results(self, tmp_path):
+        """Test that a warm engine serves snapshot results and persists them again."""
+        from src.warm_start import load_snapshot, save_snapshot
+        
+        path = tmp_path / "warm.snap"
+        # A planted result proves the value came from the snapshot, not eval
+        save_snapshot(path, CalculatorEngine(), {"2+2": "planted"})
+        engine = ConcurrentCalculatorEngine(warm_start=load_snapshot(path, CalculatorEngine()))
+        assert engine.evaluate_expression("2+2") == "planted"
+        assert engine.evaluate_expression("3+3") == "6"
+        assert engine.cached_results() == {"2+2": "planted", "3+3": "6"}
+    
+    def test_app_restores_history(self, tmp_path):
+        """Test that the app saves its snapshot on close and restores it on start."""
+        from PyQt6.QtWidgets import QApplication
+        import sys
+        
+        if not QApplication.instance():
+            self.app = QApplication(sys.argv)
+        
+        path = tmp_path / "warm.snap"
+        calculator = CalculatorApp(snapshot_path=path)
+        calculator.input_field.setText("6*7")
+        calculator.update_result()
+        calculator.save_current_calculation()
+        calculator.close()
+        
+        restored = CalculatorApp(snapshot_path=path)
+        assert restored.history_items == [{'expression': '6*7', 'result': '42'}]
+        assert restored.engine.cached_results() == {"6*7": "42"}
+        
+        # Saving again unmaps the file while replacing it, then serves the new snapshot
+        restored.input_field.setText("2+2")
+        restored.update_result()
+        restored.save_snapshot()
+        assert restored.snapshot.loaded
+        assert restored.engine.cached_results() == {"6*7": "42", "2+2": "4"}
+        assert restored.snapshot.get("2+2") == "4"
+        restored.close()
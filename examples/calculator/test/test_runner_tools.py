@@ -0,0 +1,407 @@
+"""
+Test Runner Tooling Tests
+Tests for the helper modules used by run_tests.py.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from harness import check_budgets, load_budgets, percentile
+from impact_map import MAP_VERSION, hash_tracked_files, select_tests
+from profiler import SESSION_LABEL, StackSampler, TestProfiler
+from results_db import ResultsDatabase, prune_reports, source_fingerprint
+from shared_runner import RUNNER_DIR
+import watch_runner
+from watch_runner import WarmRunner, snapshot_mtimes, watch
+
+
+class TestImpactMap:
+    """Test impact-based test selection."""
+
+    def setup_method(self):
+        """Setup a throwaway project tree."""
+        self.files = {
+            "src/engine.py": "def add(a, b):\n    return a + b\n",
+            "src/app.py": "import engine\n",
+            "test/conftest.py": "",
+            "test/test_engine.py": "def test_add():\n    pass\n",
+            "test/test_app.py": "def test_app():\n    pass\n",
+        }
+
+    def write_project(self, root):
+        """Write the project files and an impact map recorded against them."""
+        for path, content in self.files.items():
+            (root / path).parent.mkdir(parents=True, exist_ok=True)
+            (root / path).write_text(content)
+        map_path = root / "impact_map.json"
+        map_path.write_text(json.dumps({
+            "version": MAP_VERSION,
+            "files": hash_tracked_files(root),
+            "tests": {
+                "test/test_engine.py::test_add": ["src/engine.py", "test/test_engine.py"],
+                "test/test_app.py::test_app": ["src/app.py", "src/engine.py", "test/test_app.py"],
+            },
+            "failed": [],
+        }))
+        return map_path
+
+    def test_no_changes_selects_nothing(self, tmp_path):
+        """Test that an unchanged tree selects no tests."""
+        map_path = self.write_project(tmp_path)
+        assert select_tests(tmp_path, map_path) == []
+
+    def test_changed_source_selects_dependent_tests(self, tmp_path):
+        """Test that only tests depending on a changed file are selected."""
+        map_path = self.write_project(tmp_path)
+        (tmp_path / "src/app.py").write_text("import engine  # changed\n")
+        assert select_tests(tmp_path, map_path) == ["test/test_app.py::test_app"]
+
+        (tmp_path / "src/engine.py").write_text("def add(a, b):\n    return b + a\n")
+        assert len(select_tests(tmp_path, map_path)) == 2
+
+    def test_changed_test_module_runs_whole_module(self, tmp_path):
+        """Test that tests added to an existing module are selected."""
+        map_path = self.write_project(tmp_path)
+        (tmp_path / "test/test_engine.py").write_text(
+            self.files["test/test_engine.py"] + "\ndef test_brand_new():\n    assert False\n")
+        assert select_tests(tmp_path, map_path) == ["test/test_engine.py"]
+
+    def test_stale_map_falls_back_to_full_suite(self, tmp_path):
+        """Test that missing maps and infrastructure changes force a full run."""
+        assert select_tests(tmp_path, tmp_path / "missing.json") is None
+
+        map_path = self.write_project(tmp_path)
+        (tmp_path / "test/conftest.py").write_text("# changed\n")
+        assert select_tests(tmp_path, map_path) is None
+
+    def test_new_test_module_falls_back_to_full_suite(self, tmp_path):
+        """Test that an unknown test module forces a full run."""
+        map_path = self.write_project(tmp_path)
+        (tmp_path / "test/test_new.py").write_text("def test_new():\n    pass\n")
+        assert select_tests(tmp_path, map_path) is None
+
+    def test_runner_plugins_are_not_recorded(self, tmp_path):
+        """Test that the runner's own plugins in test/ are not listed as dependencies."""
+        for path, content in self.files.items():
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(content)
+        (tmp_path / "test/test_engine.py").write_text(
+            "from engine import add\n\ndef test_add():\n    assert add(1, 2) == 3\n")
+        # Laid out like a generated project: the runner and its conftest copied into test/
+        for source in RUNNER_DIR.glob("*.py"):
+            shutil.copyfile(source, tmp_path / "test" / source.name)
+        env = {**os.environ, "PYTHONPATH": str(tmp_path / "test")}
+        env.pop("RUNNER_PROJECT_DIR", None)
+
+        map_path = tmp_path / "reports/impact_map.json"
+        subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+             "-p", "impact_map", "-p", "results_db", "-p", "profiler",
+             "--impact-map", str(map_path), "--results-db", str(tmp_path / "reports/results.db"),
+             "test/test_engine.py"],
+            cwd=tmp_path, env=env, stdout=subprocess.DEVNULL, check=True
+        )
+        tests = json.loads(map_path.read_text())["tests"]
+        assert tests == {"test/test_engine.py::test_add": ["src/engine.py", "test/test_engine.py"]}
+
+
+class TestResultsDatabase:
+    """Test the structured test-results store."""
+
+    def setup_method(self):
+        """Setup run fixtures."""
+        self.started = datetime(2026, 1, 1, 12, 0, 0)
+
+    def record(self, db, results, git_revision="abc123", fingerprint=None):
+        """Record a run with the given {node_id: (outcome, duration)} results."""
+        return db.record_run(self.started, 1.0, 0, "full", git_revision, results, fingerprint)
+
+    def test_slowest_tests(self, tmp_path):
+        """Test that the slowest tests are ordered by mean duration."""
+        db = ResultsDatabase(tmp_path / "results.db")
+        self.record(db, {"a": ("passed", 0.1), "b": ("passed", 0.5)})
+        self.record(db, {"a": ("passed", 0.3), "b": ("passed", 0.7)})
+        slowest = db.slowest_tests(limit=2)
+        assert [row[0] for row in slowest] == ["b", "a"]
+        assert abs(slowest[0][1] - 0.6) < 1e-9
+        db.close()
+
+    def test_flaky_tests_and_regressions(self, tmp_path):
+        """Test flaky detection and pass-to-fail regressions."""
+        db = ResultsDatabase(tmp_path / "results.db")
+        self.record(db, {"a": ("passed", 0.1), "b": ("failed", 0.1), "c": ("failed", 0.1)})
+        self.record(db, {"a": ("failed", 0.1), "b": ("failed", 0.1), "c": ("failed", 0.1)})
+        # c was fixed by a new revision: a changed outcome, not a flaky one
+        self.record(db, {"a": ("failed", 0.1), "b": ("failed", 0.1), "c": ("passed", 0.1)},
+                    git_revision="def456")
+        assert db.flaky_tests() == [("a", 1, 1)]
+        self.record(db, {"a": ("passed", 0.1), "b": ("failed", 0.1), "c": ("failed", 0.1)},
+                    git_revision="def456")
+        assert db.flaky_tests() == [("a", 2, 2), ("c", 1, 1)]
+        assert [row[0] for row in db.regressions()] == ["c"]
+        db.close()
+
+    def test_flaky_tests_on_a_dirty_tree(self, tmp_path):
+        """Test that uncommitted edits on one +dirty revision are told apart by content."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "test").mkdir()
+        source = tmp_path / "src/engine.py"
+        source.write_text("def add(a, b):\n    return a - b\n")
+        broken = source_fingerprint(tmp_path)
+        source.write_text("def add(a, b):\n    return a + b\n")
+        fixed = source_fingerprint(tmp_path)
+        assert broken != fixed
+
+        db = ResultsDatabase(tmp_path / "results.db")
+        self.record(db, {"a": ("failed", 0.1)}, "abc123+dirty", broken)
+        self.record(db, {"a": ("passed", 0.1)}, "abc123+dirty", fixed)
+        assert db.flaky_tests() == []
+        self.record(db, {"a": ("failed", 0.1)}, "abc123+dirty", fixed)
+        assert db.flaky_tests() == [("a", 1, 1)]
+        db.close()
+
+    def test_prune_reports_by_age_and_size(self, tmp_path):
+        """Test that old reports and reports beyond the size cap are removed."""
+        old = tmp_path / "test_results_old.txt"
+        old.write_text("x")
+        two_months_ago = time.time() - 60 * 86400
+        os.utime(old, (two_months_ago, two_months_ago))
+        for i in range(3):
+            report = tmp_path / f"test_results_{i}.txt"
+            report.write_text("x" * 1024)
+            os.utime(report, (time.time() - 10 + i, time.time() - 10 + i))
+
+        removed = prune_reports(tmp_path, max_age_days=30, max_total_mb=2.5 / 1024)
+        assert {p.name for p in removed} == {"test_results_old.txt", "test_results_0.txt"}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["test_results_1.txt", "test_results_2.txt"]
+
+    def test_prune_profiles_and_benchmark_results(self, tmp_path):
+        """Test that profile directories and benchmark results are pruned too."""
+        two_months_ago = time.time() - 60 * 86400
+        old_bench = tmp_path / "bench_results_old.json"
+        old_bench.write_text("{}")
+        os.utime(old_bench, (two_months_ago, two_months_ago))
+        for i in range(2):
+            profile = tmp_path / f"profile_{i}"
+            (profile / "tests").mkdir(parents=True)
+            (profile / "tests" / "test_a.prof").write_text("x" * 1024)
+            (profile / "aggregate.prof").write_text("x" * 1024)
+            os.utime(profile, (time.time() - 10 + i, time.time() - 10 + i))
+        (tmp_path / "results.db").write_text("x" * 4096)
+
+        removed = prune_reports(tmp_path, max_age_days=30, max_total_mb=3 / 1024)
+        assert {p.name for p in removed} == {"bench_results_old.json", "profile_0"}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["profile_1", "results.db"]
+
+
+class TestWatchRunner:
+    """Test the warm, forking watch-mode runner."""
+
+    def touch(self, path, mtime_ns):
+        """Write path (if missing) and set its modification time."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            path.write_text("")
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_snapshot_mtimes(self, tmp_path):
+        """Test that Python files are tracked recursively, except in reports/."""
+        self.touch(tmp_path / "src/engine.py", 1_000_000_000)
+        self.touch(tmp_path / "test/helpers/util.py", 2_000_000_000)
+        self.touch(tmp_path / "test/reports/generated.py", 3_000_000_000)
+        (tmp_path / "test/notes.txt").write_text("not python")
+
+        mtimes = snapshot_mtimes([tmp_path / "src", tmp_path / "test"])
+        assert mtimes == {
+            str(tmp_path / "src/engine.py"): 1_000_000_000,
+            str(tmp_path / "test/helpers/util.py"): 2_000_000_000,
+        }
+
+    def test_refresh_reimports_changed_sources(self, tmp_path, monkeypatch):
+        """Test that changed src/ modules are re-imported and changed test/ plugins evicted."""
+        module = tmp_path / "src/watched_module.py"
+        module.parent.mkdir()
+        module.write_text("VALUE = 1\n")
+        self.touch(module, 1_000_000_000)
+        plugin = tmp_path / "test/watched_plugin.py"
+        plugin.parent.mkdir()
+        plugin.write_text("VALUE = 1\n")
+        self.touch(plugin, 1_000_000_000)
+        # Laid out like a generated project, with the runner in test/
+        monkeypatch.setattr(watch_runner, "RUNNER_DIR", tmp_path / "test")
+        # Keep the runner's sys.path and sys.modules changes local to this test
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.syspath_prepend(str(tmp_path / "src"))
+        monkeypatch.syspath_prepend(str(tmp_path / "test"))
+        src_package = sys.modules.get("src")
+        try:
+            # Like run_tests.py, the parent imports its plugins before starting the runner
+            import watched_plugin
+            runner = WarmRunner(tmp_path)
+            runner.preload()
+            assert sys.modules["watched_module"].VALUE == 1
+            assert not runner.refresh()
+
+            module.write_text("VALUE = 2\n")
+            self.touch(module, 2_000_000_000)
+            assert runner.refresh()
+            assert sys.modules["watched_module"].VALUE == 2
+            assert sys.modules["src.watched_module"].VALUE == 2
+            assert sys.modules["watched_plugin"] is watched_plugin
+
+            # A plugin edit is not re-imported in the parent: the children load it fresh
+            source_module = sys.modules["watched_module"]
+            plugin.write_text("VALUE = 2\n")
+            self.touch(plugin, 2_000_000_000)
+            assert runner.refresh()
+            assert "watched_plugin" not in sys.modules
+            assert sys.modules["watched_module"] is source_module
+            import watched_plugin
+            assert watched_plugin.VALUE == 2
+            assert not runner.refresh()
+        finally:
+            for name in ("watched_module", "src.watched_module", "watched_plugin", "src"):
+                sys.modules.pop(name, None)
+            if src_package is not None:
+                sys.modules["src"] = src_package
+
+    def test_shared_runner_directory_is_watched(self, tmp_path, monkeypatch):
+        """Test that a runner outside the project's test/ is watched as well."""
+        shared = tmp_path / "templates/test_runner"
+        monkeypatch.setattr(watch_runner, "RUNNER_DIR", shared)
+        assert WarmRunner(tmp_path / "project").helper_dirs == [tmp_path / "project/test", shared]
+        monkeypatch.setattr(watch_runner, "RUNNER_DIR", tmp_path / "project/test")
+        assert WarmRunner(tmp_path / "project").helper_dirs == [tmp_path / "project/test"]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_run_forwards_exit_code(self, tmp_path):
+        """Test that the forked child's pytest exit code is returned."""
+        (tmp_path / "test").mkdir()
+        (tmp_path / "test/test_pass.py").write_text("def test_pass():\n    pass\n")
+        (tmp_path / "test/test_fail.py").write_text("def test_fail():\n    assert False\n")
+        (tmp_path / "test/test_empty.py").write_text("")
+        runner = WarmRunner(tmp_path)
+
+        codes = [runner.run(["-q", "-p", "no:cacheprovider", f"test/{name}"])
+                 for name in ("test_pass.py", "test_fail.py", "test_empty.py")]
+        assert codes == [0, 1, 5]  # passed, tests failed, no tests collected
+
+    def test_watch_debounces_bursts_of_edits(self, tmp_path, monkeypatch):
+        """Test that several edits in quick succession trigger a single run."""
+        source = tmp_path / "src/engine.py"
+        test = tmp_path / "test/test_engine.py"
+        self.touch(source, 1_000_000_000)
+        self.touch(test, 1_000_000_000)
+
+        class FakeRunner:
+            src_dir = tmp_path / "src"
+            helper_dirs = [tmp_path / "test"]
+            runs = []
+
+            def run(self, args):
+                self.runs.append(args)
+                return 0
+
+        # Each sleep advances a scripted sequence of edits instead of waiting
+        script = [
+            lambda: self.touch(source, 2_000_000_000),  # poll: the burst starts
+            lambda: self.touch(source, 3_000_000_000),  # debounce: still editing
+            lambda: self.touch(test, 4_000_000_000),  # debounce: still editing
+            lambda: None,  # debounce: quiet, so one run
+            lambda: None,  # poll: nothing changed
+        ]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) > len(script):
+                raise KeyboardInterrupt
+            script[len(sleeps) - 1]()
+
+        monkeypatch.setattr(watch_runner.time, "sleep", fake_sleep)
+        runner = FakeRunner()
+        watch(runner, lambda: ["-q"], poll_interval=0.01, debounce=0.02)
+        assert len(runner.runs) == 2  # the initial run and one for the burst
+        assert sleeps == [0.01, 0.02, 0.02, 0.02, 0.01, 0.01]
+
+
+class TestProfilerPlugin:
+    """Test the profiling plugin's sampler and summary."""
+
+    def test_sampler_collapses_stacks(self, tmp_path):
+        """Test that samples are written as labelled collapsed stacks."""
+        project_root = Path(__file__).resolve().parent.parent
+        sampler = StackSampler(0.001, project_root)
+        for _ in range(2):
+            sampler._sample(None, sys._getframe())
+        sampler.label = None
+        sampler._sample(None, sys._getframe())
+
+        path = tmp_path / "stacks.collapsed"
+        sampler.write_collapsed(path)
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1
+        assert lines[0].startswith(SESSION_LABEL + ";")
+        leaf, _, count = lines[0].rpartition(";")[2].rpartition(" ")
+        assert "test_sampler_collapses_stacks (test/test_runner_tools.py:" in leaf
+        assert count == "2"
+        assert sampler.self_time()[0][1] == 2
+
+    def test_summary_lists_project_functions(self, tmp_path):
+        """Test that the summary separates project code from the rest."""
+        import cProfile
+        import pstats
+        from src.calculator_engine import CalculatorEngine
+
+        project_root = Path(__file__).resolve().parent.parent
+        profiler = TestProfiler(tmp_path, project_root, sample_interval=0, top=50)
+        engine = CalculatorEngine()
+        profile = cProfile.Profile()
+        profile.runcall(engine.evaluate_expression, "2 + 3")
+        profiler.aggregate = pstats.Stats(profile)
+
+        lines = profiler.summary_lines()
+        project = lines[lines.index("Hottest project functions (src/)") + 2:]
+        assert any("evaluate (src/calculator_engine.py:" in line for line in project)
+        assert profiler.profile_path("test/a.py::b[x]") == tmp_path / "tests" / "test_a.py_b_x_.prof"
+
+
+class TestBenchmarkHarness:
+    """Test performance budget parsing and checking."""
+
+    def test_percentile(self):
+        """Test interpolated percentiles."""
+        samples = [float(i) for i in range(1, 101)]
+        assert percentile(samples, 50) == 50.5
+        assert percentile(samples, 100) == 100.0
+        assert percentile([3.0], 95) == 3.0
+
+    def test_load_budgets_from_prd(self, tmp_path):
+        """Test that the perf_budgets JSON block is found among other blocks."""
+        prd = tmp_path / "PRD.md"
+        prd.write_text(
+            "# PRD\n\n```json\n{\"other\": 1}\n```\n\n## Performance Budgets\n\n"
+            "```json\n{\"perf_budgets\": [{\"benchmark\": \"a\", \"metric\": \"p95_ms\", \"max\": 5}]}\n```\n"
+        )
+        assert load_budgets(prd) == [{"benchmark": "a", "metric": "p95_ms", "max": 5}]
+        assert load_budgets(tmp_path / "missing.md") == []
+
+    def test_check_budgets(self):
+        """Test pass, fail and not-measured budget statuses."""
+        results = {"fast": {"p95_ms": 1.0, "ops_per_sec": 1000.0}, "stub": None}
+        budgets = [
+            {"benchmark": "fast", "metric": "p95_ms", "max": 2},
+            {"benchmark": "fast", "metric": "ops_per_sec", "min": 5000},
+            {"benchmark": "stub", "metric": "p95_ms", "max": 2},
+        ]
+        assert [status for _, _, status in check_budgets(results, budgets)] == [
+            "pass", "fail", "not measured"
+        ]
@@ -0,0 +1,29 @@
+"""
+API Service Benchmarks
+Request latency and throughput against a running service.
+
+Set BENCH_BASE_URL (e.g. http://localhost:8000) to enable; until then the
+benchmarks report "not measured", which fails ``run_tests.py --bench``
+unless --allow-unmeasured is passed.
+"""
+
+import os
+import urllib.request
+
+from harness import measure
+
+BASE_URL = os.environ.get("BENCH_BASE_URL")
+ENDPOINT = "/health"
+
+
+def _request():
+    """GET the benchmark endpoint and read the whole body."""
+    with urllib.request.urlopen(BASE_URL.rstrip("/") + ENDPOINT, timeout=10) as response:
+        response.read()
+
+
+def bench_request_roundtrip():
+    """Round-trip one request to ENDPOINT."""
+    if not BASE_URL:
+        return None
+    return measure(_request, repeat=200, warmup=10)
@@ -0,0 +1,27 @@
+"""
+CLI Tool Benchmarks
+End-to-end command latency, including interpreter start-up.
+
+CLI_COMMAND defaults to ``src/main.py --help`` when that file exists; point it
+at the real entry point (e.g. [sys.executable, "-m", "mytool", "--help"]).
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from harness import measure
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+ENTRY_POINT = PROJECT_DIR / "src" / "main.py"
+CLI_COMMAND = [sys.executable, str(ENTRY_POINT), "--help"] if ENTRY_POINT.exists() else None
+
+
+def bench_cli_startup():
+    """Run the command once per sample, as a user would."""
+    if CLI_COMMAND is None:
+        return None
+    return measure(
+        lambda: subprocess.run(CLI_COMMAND, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+        repeat=20, warmup=2
+    )
@@ -0,0 +1,45 @@
+"""
+ML System Benchmarks
+Single-prediction latency and batch throughput of the serving model.
+
+Implement load_model() and make_inputs() for this project; until then the
+benchmarks report "not measured", which fails ``run_tests.py --bench``
+unless --allow-unmeasured is passed.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from harness import measure  # noqa: E402
+
+BATCH_SIZE = 256
+
+
+def load_model():
+    """Return an object with a predict(inputs) method, or None if not available yet."""
+    return None
+
+
+def make_inputs(count):
+    """Return count representative model inputs."""
+    return [[0.0] * 10 for _ in range(count)]
+
+
+def bench_prediction_latency():
+    """Predict one input at a time (online serving path)."""
+    model = load_model()
+    if model is None:
+        return None
+    sample = make_inputs(1)
+    return measure(lambda: model.predict(sample), repeat=200, warmup=10)
+
+
+def bench_batch_prediction():
+    """Predict BATCH_SIZE inputs per call; ops_per_sec counts batches."""
+    model = load_model()
+    if model is None:
+        return None
+    batch = make_inputs(BATCH_SIZE)
+    return measure(lambda: model.predict(batch), repeat=50, warmup=3)
@@ -0,0 +1,47 @@
+"""
+Trading Dashboard Benchmarks
+Market-data update handling and indicator calculation latency.
+
+Wire handle_market_update() and calculate_indicators() to the project's code;
+until then the benchmarks report "not measured", which fails
+``run_tests.py --bench`` unless --allow-unmeasured is passed.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
+
+from harness import measure  # noqa: E402
+
+HISTORY_LENGTH = 5000
+
+handle_market_update = None   # callable(tick: dict) -> None
+calculate_indicators = None   # callable(prices: list) -> object
+
+
+def _prices(count):
+    """Synthetic random-walk price series."""
+    random.seed(42)
+    price, prices = 100.0, []
+    for _ in range(count):
+        price *= 1 + random.gauss(0, 0.001)
+        prices.append(price)
+    return prices
+
+
+def bench_market_update():
+    """Process one incoming tick, including any derived state updates."""
+    if handle_market_update is None:
+        return None
+    tick = {"symbol": "TEST", "price": 100.0, "volume": 10}
+    return measure(lambda: handle_market_update(tick), repeat=200, warmup=10)
+
+
+def bench_indicator_calculation():
+    """Recompute indicators over HISTORY_LENGTH prices."""
+    if calculate_indicators is None:
+        return None
+    prices = _prices(HISTORY_LENGTH)
+    return measure(lambda: calculate_indicators(prices), repeat=50, warmup=3)
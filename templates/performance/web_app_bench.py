@@ -0,0 +1,37 @@
+"""
+Web Application Benchmarks
+Page load and API round-trip latency against a running development server.
+
+Set BENCH_BASE_URL (e.g. http://localhost:3000) to enable; until then the
+benchmarks report "not measured", which fails ``run_tests.py --bench``
+unless --allow-unmeasured is passed.
+"""
+
+import os
+import urllib.request
+
+from harness import measure
+
+BASE_URL = os.environ.get("BENCH_BASE_URL")
+PAGE_PATH = "/"
+API_PATH = "/api/health"
+
+
+def _fetch(path):
+    """GET a path and read the whole body."""
+    with urllib.request.urlopen(BASE_URL.rstrip("/") + path, timeout=10) as response:
+        response.read()
+
+
+def bench_page_load():
+    """Fetch the main page (HTML only; use browser tooling for full render timing)."""
+    if not BASE_URL:
+        return None
+    return measure(lambda: _fetch(PAGE_PATH), repeat=50, warmup=3)
+
+
+def bench_api_roundtrip():
+    """Round-trip a lightweight API endpoint."""
+    if not BASE_URL:
+        return None
+    return measure(lambda: _fetch(API_PATH), repeat=100, warmup=5)
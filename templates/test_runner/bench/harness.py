@@ -0,0 +1,150 @@
+"""
+Benchmark Harness
+Discovers and times benchmarks, and checks results against the PRD performance budgets.
+
+Benchmarks live next to this file in ``bench_*.py`` modules. Every module-level
+function named ``bench_<name>`` is a benchmark called ``<name>``; it returns a
+dict of metrics (usually from measure()) or None when it cannot run yet, e.g.
+because the code under test has not been wired in.
+
+Budgets are read from the first ```json block in PRD.md that contains a
+``perf_budgets`` list. Each budget names a benchmark, a metric and a ``max``
+and/or ``min`` target:
+
+    {"perf_budgets": [
+        {"benchmark": "evaluate_simple", "metric": "p95_ms", "max": 1.0}
+    ]}
+"""
+
+import importlib.util
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+JSON_BLOCK = re.compile(r"```json\s*\n(.*?)\n```", re.DOTALL)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of samples (linear interpolation)."""
+    ordered = sorted(samples)
+    if not ordered:
+        raise ValueError("percentile of empty sample")
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """Summarize per-call latencies in milliseconds."""
+    mean = sum(samples_ms) / len(samples_ms)
+    return {
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+        "mean_ms": mean,
+        "ops_per_sec": 1000.0 / mean if mean else float("inf"),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int = 200, warmup: int = 10,
+            number: int = 1) -> Dict[str, float]:
+    """
+    Time func: warmup calls, then repeat samples of number calls each.
+
+    Latency metrics are per call, so a fast function can be batched with
+    number > 1 without changing what the budgets mean.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return summarize(samples)
+
+
+def discover(bench_dir: Path = BENCH_DIR) -> List[Tuple[str, Callable]]:
+    """Import every bench_*.py module and return its (name, function) benchmarks."""
+    if str(bench_dir) not in sys.path:
+        sys.path.insert(0, str(bench_dir))
+    benchmarks = []
+    for path in sorted(bench_dir.glob("bench_*.py")):
+        spec = importlib.util.spec_from_file_location(f"bench_modules.{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for attr in sorted(vars(module)):
+            func = getattr(module, attr)
+            if attr.startswith("bench_") and callable(func) and func.__module__ == module.__name__:
+                benchmarks.append((attr[len("bench_"):], func))
+    return benchmarks
+
+
+def run_benchmarks(bench_dir: Path = BENCH_DIR,
+                   selected: Optional[List[str]] = None) -> Dict[str, Optional[Dict[str, float]]]:
+    """Run the discovered benchmarks (optionally only the selected names)."""
+    results = {}
+    for name, func in discover(bench_dir):
+        if selected and name not in selected:
+            continue
+        results[name] = func()
+    return results
+
+
+def load_budgets(prd_path: Path) -> List[Dict]:
+    """Read the machine-readable perf_budgets list from a PRD, or [] if absent."""
+    try:
+        text = Path(prd_path).read_text()
+    except OSError:
+        return []
+    for block in JSON_BLOCK.findall(text):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and "perf_budgets" in data:
+            return list(data["perf_budgets"])
+    return []
+
+
+def check_budgets(results: Dict[str, Optional[Dict[str, float]]],
+                  budgets: List[Dict]) -> List[Tuple[Dict, Optional[float], str]]:
+    """
+    Compare results with budgets.
+
+    Returns (budget, measured value, status) with status "pass", "fail" or
+    "not measured" (benchmark missing, skipped, or metric not reported).
+    """
+    checks = []
+    for budget in budgets:
+        metrics = results.get(budget["benchmark"]) or {}
+        value = metrics.get(budget["metric"])
+        if value is None:
+            checks.append((budget, None, "not measured"))
+            continue
+        ok = True
+        if "max" in budget and value > budget["max"]:
+            ok = False
+        if "min" in budget and value < budget["min"]:
+            ok = False
+        checks.append((budget, value, "pass" if ok else "fail"))
+    return checks
+
+
+def format_checks(checks: List[Tuple[Dict, Optional[float], str]]) -> str:
+    """Render budget checks as a table."""
+    lines = [f"{'benchmark':<28} {'metric':<12} {'target':>14} {'measured':>12}  status"]
+    for budget, value, status in checks:
+        target = " ".join(
+            f"{bound}{budget[key]:g}" for key, bound in (("max", "<="), ("min", ">=")) if key in budget
+        )
+        measured = "-" if value is None else f"{value:.4g}"
+        lines.append(f"{budget['benchmark']:<28} {budget['metric']:<12} {target:>14} {measured:>12}  {status}")
+    return "\n".join(lines)
@@ -0,0 +1,214 @@
+"""
+Test Impact Map
+Records which project files each test touches and selects tests affected by changes.
+
+Loaded into pytest by run_tests.py with ``-p impact_map``. While a test runs, a
+call-level trace hook records every project source file whose code executes
+(setup, call and teardown), except the runner's own plugins. The resulting map
+is cached as JSON together with a content hash of every tracked file, so a later
+``--changed`` run only needs to re-run the tests whose dependencies hashed
+differently.
+
+PYTEST_DONT_REWRITE (run_tests.py imports this module before pytest starts)
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import pytest
+
+from runner_paths import PROJECT_DIR, RUNNER_DIR
+
+MAP_VERSION = 1
+
+# Directories (relative to the project root) whose Python files are tracked
+TRACKED_DIRS = ("src", "test")
+
+# Files whose changes can affect every test; a change forces the full suite
+INFRASTRUCTURE_FILES = ("test/conftest.py", "test/run_tests.py", "test/impact_map.py")
+
+# The runner's pytest plugins (next to this file). Their hooks run within every
+# test's protocol, so they are never recorded as a test's dependencies.
+PLUGIN_FILES = ("impact_map.py", "results_db.py", "profiler.py")
+
+
+def hash_file(path: Path) -> str:
+    """Return the content hash used to detect changed files."""
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def hash_tracked_files(project_root: Path) -> Dict[str, str]:
+    """Hash every tracked Python file, keyed by project-relative POSIX path."""
+    hashes = {}
+    for dir_name in TRACKED_DIRS:
+        for path in sorted((project_root / dir_name).rglob("*.py")):
+            if "reports" in path.parts:
+                continue
+            hashes[path.relative_to(project_root).as_posix()] = hash_file(path)
+    return hashes
+
+
+def load_map(map_path: Path) -> Optional[Dict]:
+    """Load a cached impact map, or None if it is missing or unreadable."""
+    try:
+        data = json.loads(map_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MAP_VERSION:
+        return None
+    return data
+
+
+def select_tests(project_root: Path, map_path: Path) -> Optional[List[str]]:
+    """
+    Select the tests affected by changes since the map was recorded.
+
+    Returns a (possibly empty) list of node ids and whole test module paths,
+    or None when the map is missing or stale and the full suite has to run
+    instead.
+    """
+    impact_map = load_map(map_path)
+    if impact_map is None:
+        return None
+
+    recorded = impact_map["files"]
+    current = hash_tracked_files(project_root)
+
+    changed = {path for path, digest in current.items() if recorded.get(path) != digest}
+    removed = set(recorded) - set(current)
+    if removed or changed.intersection(INFRASTRUCTURE_FILES):
+        return None
+
+    tests = impact_map["tests"]
+    known_files = {path for deps in tests.values() for path in deps}
+    for path in changed:
+        # A new or never-executed test module means the map cannot know its tests
+        if Path(path).name.startswith("test_") and path not in known_files:
+            return None
+
+    # A changed test module runs whole, so tests added to it are collected too
+    changed_modules = {path for path in changed if Path(path).name.startswith("test_")}
+    selected = set(changed_modules)
+    selected.update(
+        node_id for node_id, deps in tests.items()
+        if changed.intersection(deps) and node_id.partition("::")[0] not in changed_modules
+    )
+    # Tests that failed last time are re-run until they pass
+    selected.update(n for n in impact_map.get("failed", [])
+                    if n in tests and n.partition("::")[0] not in changed_modules)
+    return sorted(selected)
+
+
+class ImpactRecorder:
+    """Pytest plugin that traces the project files executed by each test."""
+
+    def __init__(self, project_root: Path, map_path: Path):
+        """Initialize the recorder for the given project."""
+        self.project_root = project_root
+        self.map_path = map_path
+        self.tests: Dict[str, Set[str]] = {}
+        self.failed: Set[str] = set()
+        self._current: Optional[Set[str]] = None
+        self._node_ids: Dict[str, str] = {}
+        self._file_cache: Dict[str, Optional[str]] = {}
+        self._tracked_roots = tuple(str(project_root / d) for d in TRACKED_DIRS)
+        self._plugin_files = {str(RUNNER_DIR / name) for name in PLUGIN_FILES}
+
+    def _relative_path(self, filename: str) -> Optional[str]:
+        """Map a code object's filename to a tracked project path (cached)."""
+        try:
+            return self._file_cache[filename]
+        except KeyError:
+            pass
+        resolved = str(Path(filename).resolve())
+        relative = None
+        if resolved not in self._plugin_files and resolved.startswith(self._tracked_roots):
+            relative = Path(resolved).relative_to(self.project_root).as_posix()
+        self._file_cache[filename] = relative
+        return relative
+
+    def _trace(self, frame, event, arg):
+        """Record the file of every called function; no per-line tracing."""
+        if event == "call" and self._current is not None:
+            path = self._relative_path(frame.f_code.co_filename)
+            if path is not None:
+                self._current.add(path)
+        return None
+
+    def node_id(self, item) -> str:
+        """Build a node id relative to the project root, independent of rootdir."""
+        relative = Path(item.path).resolve().relative_to(self.project_root).as_posix()
+        _, _, rest = item.nodeid.partition("::")
+        return f"{relative}::{rest}" if rest else relative
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        """Trace the whole test protocol, including fixtures."""
+        node_id = self.node_id(item)
+        deps = {node_id.partition("::")[0]}
+        self._node_ids[item.nodeid] = node_id
+        self._current = deps
+        sys.settrace(self._trace)
+        threading.settrace(self._trace)
+        try:
+            yield
+        finally:
+            sys.settrace(None)
+            threading.settrace(None)
+            self._current = None
+            self.tests[node_id] = deps
+
+    def pytest_runtest_logreport(self, report):
+        """Remember failing tests so they are re-selected next time."""
+        if report.failed and report.nodeid in self._node_ids:
+            self.failed.add(self._node_ids[report.nodeid])
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        """Merge this run's results into the cached map."""
+        if not self.tests:
+            return
+        previous = load_map(self.map_path)
+        complete = len(self.tests) >= session.testscollected
+        if previous is None and not complete:
+            return
+        impact_map = previous or {"tests": {}, "failed": []}
+
+        # An interrupted run keeps the old hashes so skipped tests stay selected
+        current = hash_tracked_files(self.project_root)
+        files = current if complete else impact_map["files"]
+
+        tests = impact_map["tests"]
+        tests.update({node_id: sorted(deps) for node_id, deps in self.tests.items()})
+        # Drop tests whose modules no longer exist
+        tests = {n: d for n, d in tests.items() if n.partition("::")[0] in current}
+
+        failed = set(impact_map.get("failed", [])) - set(self.tests)
+        failed |= self.failed
+
+        self.map_path.parent.mkdir(parents=True, exist_ok=True)
+        self.map_path.write_text(json.dumps({
+            "version": MAP_VERSION,
+            "files": files,
+            "tests": tests,
+            "failed": sorted(failed & set(tests)),
+        }, indent=1, sort_keys=True))
+
+
+def pytest_addoption(parser):
+    """Register the impact map option."""
+    parser.addoption("--impact-map", default=None,
+                     help="Record per-test file dependencies into this JSON file")
+
+
+def pytest_configure(config):
+    """Activate the recorder when an impact map path is given."""
+    map_path = config.getoption("--impact-map")
+    if map_path:
+        project_root = PROJECT_DIR
+        config.pluginmanager.register(
+            ImpactRecorder(project_root, Path(map_path).resolve()), "impact_recorder"
+        )
@@ -0,0 +1,250 @@
+"""
+Test Profiler
+Profiles every test with cProfile and samples the whole run with a SIGPROF timer.
+
+Loaded into pytest by ``run_tests.py --profile`` with ``-p profiler``. Writes
+into --profile-dir:
+
+    tests/<node id>.prof   cProfile stats of one test (setup, call, teardown)
+    aggregate.prof         all per-test stats merged (pstats, snakeviz, ...)
+    stacks.collapsed       sampled stacks as "root;...;leaf count" lines, rooted
+                           at the test id (flamegraph.pl, speedscope, inferno)
+
+and ends the run with the hottest functions, listing project code (src/)
+separately so regressions in the code under test stand out.
+The sampler uses ITIMER_PROF (process CPU time), so it is only available
+on POSIX systems; elsewhere only cProfile runs.
+"""
+
+import cProfile
+import pstats
+import re
+import signal
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from runner_paths import PROJECT_DIR
+
+DEFAULT_SAMPLE_INTERVAL = 0.001
+DEFAULT_TOP = 15
+
+# Label for samples taken outside any test (collection, session fixtures)
+SESSION_LABEL = "(session)"
+
+_UNSAFE_FILENAME = re.compile(r'[^\w.-]+')
+
+
+class StackSampler:
+    """Counts Python stacks seen by a SIGPROF timer, keyed by collapsed stack."""
+
+    def __init__(self, interval: float, project_root: Path):
+        """Initialize the sampler; interval is in CPU seconds."""
+        self.interval = interval
+        self.project_root = str(project_root) + "/"
+        self.counts: Counter = Counter()
+        self.label = SESSION_LABEL
+        self._frame_names: Dict[object, str] = {}
+        self._previous_handler = None
+
+    @staticmethod
+    def available() -> bool:
+        """True if the platform provides the profiling timer."""
+        return hasattr(signal, "setitimer") and hasattr(signal, "SIGPROF")
+
+    def frame_name(self, code) -> str:
+        """Name a code object as "function (file:line)", project paths relative."""
+        try:
+            return self._frame_names[code]
+        except KeyError:
+            pass
+        filename = code.co_filename
+        if filename.startswith(self.project_root):
+            filename = filename[len(self.project_root):]
+        else:
+            filename = Path(filename).name
+        name = f"{getattr(code, 'co_qualname', code.co_name)} ({filename}:{code.co_firstlineno})"
+        self._frame_names[code] = name
+        return name
+
+    def _sample(self, signum, frame):
+        """Record the interrupted stack (unless paused by a None label)."""
+        if self.label is None:
+            return
+        stack = []
+        while frame is not None:
+            stack.append(self.frame_name(frame.f_code))
+            frame = frame.f_back
+        stack.append(self.label)
+        stack.reverse()
+        self.counts[";".join(stack)] += 1
+
+    def start(self) -> None:
+        """Install the signal handler and start the timer."""
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self) -> None:
+        """Stop the timer and restore the previous handler."""
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+    def write_collapsed(self, path: Path) -> None:
+        """Write the samples in collapsed-stack format."""
+        with open(path, "w") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+    def self_time(self) -> List[Tuple[str, int]]:
+        """Return leaf frames by sample count, highest first."""
+        leaves: Counter = Counter()
+        for stack, count in self.counts.items():
+            leaves[stack.rpartition(";")[2]] += count
+        return leaves.most_common()
+
+
+class TestProfiler:
+    """Pytest plugin writing per-test and aggregate profiles for one run."""
+
+    __test__ = False  # not a test class, despite the name
+
+    def __init__(self, profile_dir: Path, project_root: Path, sample_interval: float, top: int):
+        """Initialize the profiler."""
+        self.profile_dir = profile_dir
+        self.tests_dir = profile_dir / "tests"
+        self.project_root = project_root
+        self.top = top
+        self.aggregate: Optional[pstats.Stats] = None
+        self.profiled_tests = 0
+        self.sampler = None
+        if sample_interval > 0 and StackSampler.available():
+            self.sampler = StackSampler(sample_interval, project_root)
+
+    def node_id(self, item) -> str:
+        """Build a node id relative to the project root, independent of rootdir."""
+        relative = Path(item.path).resolve().relative_to(self.project_root).as_posix()
+        _, _, rest = item.nodeid.partition("::")
+        return f"{relative}::{rest}" if rest else relative
+
+    def profile_path(self, node_id: str) -> Path:
+        """Return an unused file name for a test's profile."""
+        stem = _UNSAFE_FILENAME.sub("_", node_id)[:180]
+        path = self.tests_dir / f"{stem}.prof"
+        suffix = 1
+        while path.exists():
+            path = self.tests_dir / f"{stem}-{suffix}.prof"
+            suffix += 1
+        return path
+
+    def pytest_sessionstart(self, session):
+        """Create the output directories and start sampling."""
+        self.tests_dir.mkdir(parents=True, exist_ok=True)
+        if self.sampler:
+            self.sampler.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        """Profile the whole test protocol, including fixtures."""
+        node_id = self.node_id(item)
+        if self.sampler:
+            self.sampler.label = node_id
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+
+        # Keep the profiler's own bookkeeping out of the samples
+        if self.sampler:
+            self.sampler.label = None
+        profile.dump_stats(self.profile_path(node_id))
+        stats = pstats.Stats(profile)
+        if self.aggregate is None:
+            self.aggregate = stats
+        else:
+            self.aggregate.add(stats)
+        self.profiled_tests += 1
+        if self.sampler:
+            self.sampler.label = SESSION_LABEL
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        """Stop sampling and write the aggregate profile and collapsed stacks."""
+        if self.sampler:
+            self.sampler.stop()
+            self.sampler.write_collapsed(self.profile_dir / "stacks.collapsed")
+        if self.aggregate is not None:
+            self.aggregate.dump_stats(self.profile_dir / "aggregate.prof")
+
+    def function_name(self, function: Tuple[str, int, str]) -> str:
+        """Format a pstats function key, with project paths relative."""
+        filename, line, name = function
+        if filename == "~":
+            return name
+        path = Path(filename)
+        try:
+            filename = path.resolve().relative_to(self.project_root).as_posix()
+        except ValueError:
+            filename = path.name
+        return f"{name} ({filename}:{line})"
+
+    def is_project_code(self, function: Tuple[str, int, str]) -> bool:
+        """True for functions defined under the project's src/ directory."""
+        filename = function[0]
+        return filename != "~" and Path(filename).resolve().is_relative_to(self.project_root / "src")
+
+    def summary_lines(self) -> List[str]:
+        """Build the hot function summary printed at the end of the run."""
+        lines = []
+        if self.aggregate is not None:
+            # The sampler's signal handler runs under cProfile too; leave it out
+            this_file = str(Path(__file__).resolve())
+            rows = sorted((row for row in self.aggregate.stats.items() if row[0][0] != this_file),
+                          key=lambda row: row[1][2], reverse=True)
+            header = f"{'own s':>8} {'total s':>8} {'calls':>9}  function"
+            for title, selected in (
+                ("Hottest functions by own time (cProfile, all tests)", rows),
+                ("Hottest project functions (src/)", [row for row in rows if self.is_project_code(row[0])]),
+            ):
+                lines += ["", title, header]
+                for function, (_, calls, own, total, _) in selected[:self.top]:
+                    lines.append(f"{own:>8.3f} {total:>8.3f} {calls:>9}  {self.function_name(function)}")
+
+        if self.sampler and self.sampler.counts:
+            samples = sum(self.sampler.counts.values())
+            lines += ["", f"Sampled self time ({samples} samples every {self.sampler.interval * 1000:g} ms CPU)"]
+            for frame, count in self.sampler.self_time()[:self.top]:
+                lines.append(f"{count / samples:>8.1%}  {frame}")
+
+        lines += ["", f"Profiled {self.profiled_tests} test(s); profiles written to: {self.profile_dir}"]
+        return lines
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Print the hot function summary."""
+        terminalreporter.section("profile")
+        for line in self.summary_lines():
+            terminalreporter.write_line(line)
+
+
+def pytest_addoption(parser):
+    """Register the profiling options."""
+    parser.addoption("--profile-dir", default=None,
+                     help="Profile every test and write the profiles into this directory")
+    parser.addoption("--profile-interval", type=float, default=DEFAULT_SAMPLE_INTERVAL,
+                     help="CPU seconds between stack samples (0 disables sampling)")
+    parser.addoption("--profile-top", type=int, default=DEFAULT_TOP,
+                     help="Number of hot functions to list at the end of the run")
+
+
+def pytest_configure(config):
+    """Activate the profiler when a profile directory is given."""
+    profile_dir = config.getoption("--profile-dir")
+    if profile_dir:
+        project_root = PROJECT_DIR
+        config.pluginmanager.register(
+            TestProfiler(Path(profile_dir).resolve(), project_root,
+                         config.getoption("--profile-interval"), config.getoption("--profile-top")),
+            "test_profiler"
+        )
@@ -0,0 +1,341 @@
+"""
+Test Results Database
+Records every test run into SQLite and reports slow, flaky and regressed tests.
+
+Loaded into pytest by run_tests.py with ``-p results_db``. Each run stores one
+row of run metadata (start time, duration, exit status, mode, git revision,
+source fingerprint, Python version and platform) plus one row per test with its outcome and
+duration. The query helpers below back ``run_tests.py --report``.
+
+PYTEST_DONT_REWRITE (run_tests.py imports this module before pytest starts)
+"""
+
+import hashlib
+import json
+import platform
+import shutil
+import sqlite3
+import subprocess
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from impact_map import hash_tracked_files
+from runner_paths import PROJECT_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    duration REAL NOT NULL,
+    exit_status INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    git_revision TEXT,
+    source_fingerprint TEXT,
+    python_version TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    tests INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    node_id TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (run_id, node_id)
+);
+CREATE INDEX IF NOT EXISTS results_node ON results(node_id);
+"""
+
+# Outcome precedence when a test reports several phases (setup/call/teardown)
+OUTCOME_RANK = {"passed": 0, "skipped": 1, "failed": 2, "error": 3}
+
+
+def git_revision(cwd: Path) -> Optional[str]:
+    """Return the current git revision (with a +dirty marker), or None outside git."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=cwd, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no", "."],
+            capture_output=True, text=True, cwd=cwd, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}+dirty" if dirty else revision
+
+
+def source_fingerprint(project_root: Path) -> str:
+    """
+    Hash the contents of every tracked source and test file.
+
+    Unlike the git revision, this tells apart runs on different uncommitted
+    edits of a dirty tree.
+    """
+    hashes = hash_tracked_files(project_root)
+    return hashlib.sha1(json.dumps(hashes, sort_keys=True).encode()).hexdigest()
+
+
+class ResultsDatabase:
+    """SQLite store of test runs and per-test results."""
+
+    def __init__(self, path: Path):
+        """Open (and create if needed) the database at path."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+        # Databases created before source fingerprints were recorded
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        if "source_fingerprint" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE runs ADD COLUMN source_fingerprint TEXT")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def record_run(self, started_at: datetime, duration: float, exit_status: int,
+                   mode: str, git_rev: Optional[str],
+                   results: Dict[str, Tuple[str, float]],
+                   fingerprint: Optional[str] = None) -> int:
+        """Store one run and its per-test (outcome, duration) results."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, duration, exit_status, mode, git_revision,"
+                " source_fingerprint, python_version, platform, tests)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (started_at.isoformat(timespec="seconds"), duration, exit_status, mode,
+                 git_rev, fingerprint, platform.python_version(), platform.platform(), len(results))
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO results (run_id, node_id, outcome, duration) VALUES (?, ?, ?, ?)",
+                [(run_id, node_id, outcome, dur) for node_id, (outcome, dur) in results.items()]
+            )
+        return run_id
+
+    def recent_run_ids(self, limit: int) -> List[int]:
+        """Return the ids of the most recent runs, newest first."""
+        rows = self.conn.execute("SELECT id FROM runs ORDER BY id DESC LIMIT ?", (limit,))
+        return [row[0] for row in rows]
+
+    def slowest_tests(self, limit: int = 10, window: int = 20) -> List[Tuple[str, float, int]]:
+        """Return (node_id, mean duration, samples) for the slowest tests of recent runs."""
+        run_ids = self.recent_run_ids(window)
+        if not run_ids:
+            return []
+        marks = ",".join("?" * len(run_ids))
+        return self.conn.execute(
+            f"SELECT node_id, AVG(duration), COUNT(*) FROM results WHERE run_id IN ({marks})"
+            " AND outcome != 'skipped' GROUP BY node_id ORDER BY AVG(duration) DESC LIMIT ?",
+            (*run_ids, limit)
+        ).fetchall()
+
+    def duration_trends(self, limit: int = 10, window: int = 10) -> List[Tuple[str, float, float]]:
+        """
+        Compare mean durations of the last window runs with the window before.
+
+        Returns (node_id, previous mean, recent mean) sorted by largest slowdown.
+        """
+        run_ids = self.recent_run_ids(2 * window)
+        recent, previous = run_ids[:window], run_ids[window:]
+        if not recent or not previous:
+            return []
+        means = []
+        for group in (recent, previous):
+            marks = ",".join("?" * len(group))
+            means.append(dict(self.conn.execute(
+                f"SELECT node_id, AVG(duration) FROM results WHERE run_id IN ({marks})"
+                " AND outcome != 'skipped' GROUP BY node_id", group
+            ).fetchall()))
+        recent_means, previous_means = means
+        trends = [
+            (node_id, previous_means[node_id], mean)
+            for node_id, mean in recent_means.items() if node_id in previous_means
+        ]
+        trends.sort(key=lambda t: t[2] - t[1], reverse=True)
+        return trends[:limit]
+
+    def flaky_tests(self, window: int = 20) -> List[Tuple[str, int, int]]:
+        """
+        Return (node_id, passes, failures) for tests that both passed and failed
+        recently on the same sources (source fingerprint, or git revision for
+        runs recorded without one); an outcome that changed along with the
+        code, committed or not, is not flakiness.
+        """
+        run_ids = self.recent_run_ids(window)
+        if not run_ids:
+            return []
+        marks = ",".join("?" * len(run_ids))
+        return self.conn.execute(
+            "SELECT node_id, SUM(passes), SUM(failures) FROM ("
+            " SELECT node_id, SUM(outcome = 'passed') AS passes,"
+            " SUM(outcome IN ('failed', 'error')) AS failures"
+            f" FROM results JOIN runs ON runs.id = results.run_id WHERE run_id IN ({marks})"
+            " GROUP BY node_id, COALESCE(source_fingerprint, git_revision)"
+            " HAVING passes > 0 AND failures > 0"
+            ") GROUP BY node_id ORDER BY node_id", run_ids
+        ).fetchall()
+
+    def regressions(self) -> List[Tuple[str, str, str]]:
+        """
+        Return tests that passed in their previous run but fail in the latest run.
+
+        Each entry is (node_id, previous run start, latest run start). Only tests
+        that ran in the latest run are considered, so partial runs compare fairly.
+        """
+        latest = self.recent_run_ids(1)
+        if not latest:
+            return []
+        return self.conn.execute(
+            "SELECT cur.node_id, prev_run.started_at, cur_run.started_at"
+            " FROM results cur JOIN runs cur_run ON cur_run.id = cur.run_id"
+            " JOIN results prev ON prev.node_id = cur.node_id AND prev.run_id = ("
+            "   SELECT MAX(run_id) FROM results WHERE node_id = cur.node_id AND run_id < cur.run_id)"
+            " JOIN runs prev_run ON prev_run.id = prev.run_id"
+            " WHERE cur.run_id = ? AND cur.outcome IN ('failed', 'error')"
+            " AND prev.outcome = 'passed' ORDER BY cur.node_id", latest
+        ).fetchall()
+
+
+def format_report(db: ResultsDatabase, limit: int = 10) -> str:
+    """Render the slow/trend/flaky/regression report as plain text."""
+    lines = []
+    runs = db.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    lines.append(f"Test results database: {db.path} ({runs} runs)")
+
+    lines.append("\nSlowest tests (mean over recent runs):")
+    for node_id, mean, samples in db.slowest_tests(limit):
+        lines.append(f"  {mean * 1000:9.1f} ms  {node_id}  (n={samples})")
+
+    lines.append("\nDuration trends (previous -> recent mean):")
+    for node_id, previous, recent in db.duration_trends(limit):
+        change = (recent - previous) / previous * 100 if previous else 0.0
+        lines.append(f"  {previous * 1000:8.1f} -> {recent * 1000:8.1f} ms ({change:+6.1f}%)  {node_id}")
+
+    lines.append("\nFlaky tests (passed and failed on the same sources in recent runs):")
+    for node_id, passes, failures in db.flaky_tests():
+        lines.append(f"  {node_id}  ({passes} passed, {failures} failed)")
+
+    lines.append("\nRegressions (passed previously, failing in latest run):")
+    for node_id, previous, latest in db.regressions():
+        lines.append(f"  {node_id}  (passed {previous}, failed {latest})")
+
+    return "\n".join(lines)
+
+
+# Per-run artifacts in the reports directory that are subject to pruning
+REPORT_PATTERNS = ("test_results_*.txt", "bench_results_*.json", "profile_*")
+
+
+def _artifact_size(path: Path) -> int:
+    """Size in bytes of a report file, or of all files in a profile directory."""
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size
+
+
+def _remove_artifact(path: Path) -> None:
+    """Delete a report file or profile directory."""
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def prune_reports(reports_dir: Path, max_age_days: float, max_total_mb: float) -> List[Path]:
+    """
+    Delete old run artifacts (text reports, benchmark results, profile
+    directories): anything older than max_age_days, then the oldest until the
+    remaining artifacts fit in max_total_mb. Returns removed paths.
+    """
+    artifacts = sorted((path for pattern in REPORT_PATTERNS for path in reports_dir.glob(pattern)),
+                       key=lambda p: p.stat().st_mtime)
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).timestamp()
+    removed = []
+
+    kept = []
+    for artifact in artifacts:
+        if artifact.stat().st_mtime < cutoff:
+            _remove_artifact(artifact)
+            removed.append(artifact)
+        else:
+            kept.append((artifact, _artifact_size(artifact)))
+
+    total = sum(size for _, size in kept)
+    limit = max_total_mb * 1024 * 1024
+    while kept and total > limit:
+        artifact, size = kept.pop(0)
+        total -= size
+        _remove_artifact(artifact)
+        removed.append(artifact)
+    return removed
+
+
+class ResultsRecorder:
+    """Pytest plugin collecting per-test outcomes and durations for one run."""
+
+    def __init__(self, db_path: Path, mode: str, project_root: Path, rootdir: Path):
+        """Initialize the recorder."""
+        self.db_path = db_path
+        self.mode = mode
+        self.project_root = project_root
+        self.rootdir = rootdir
+        self.results: Dict[str, Tuple[str, float]] = {}
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        # Fingerprint the sources the tests start from; edits during the run don't count
+        self.fingerprint = source_fingerprint(project_root)
+
+    def node_id(self, report) -> str:
+        """Build a node id relative to the project root, independent of rootdir."""
+        path, _, rest = report.nodeid.partition("::")
+        try:
+            path = (self.rootdir / path).resolve().relative_to(self.project_root).as_posix()
+        except ValueError:
+            pass
+        return f"{path}::{rest}" if rest else path
+
+    def pytest_runtest_logreport(self, report):
+        """Accumulate outcome and duration across setup, call and teardown."""
+        node_id = self.node_id(report)
+        outcome = report.outcome
+        if report.failed and report.when != "call":
+            outcome = "error"
+        previous, duration = self.results.get(node_id, ("passed", 0.0))
+        if OUTCOME_RANK[previous] > OUTCOME_RANK[outcome]:
+            outcome = previous
+        self.results[node_id] = (outcome, duration + report.duration)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        """Write the run into the database."""
+        db = ResultsDatabase(self.db_path)
+        try:
+            db.record_run(self.started_at, time.perf_counter() - self._start, int(exitstatus),
+                          self.mode, git_revision(self.project_root), self.results, self.fingerprint)
+        finally:
+            db.close()
+
+
+def pytest_addoption(parser):
+    """Register the results database options."""
+    parser.addoption("--results-db", default=None,
+                     help="Record per-test outcomes and durations into this SQLite file")
+    parser.addoption("--results-mode", default="full",
+                     help="Run mode stored with the run metadata")
+
+
+def pytest_configure(config):
+    """Activate the recorder when a database path is given."""
+    db_path = config.getoption("--results-db")
+    if db_path:
+        project_root = PROJECT_DIR
+        config.pluginmanager.register(
+            ResultsRecorder(Path(db_path).resolve(), config.getoption("--results-mode"),
+                            project_root, config.rootpath),
+            "results_recorder"
+        )
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Simple test runner with timestamped output files.
+Runs pytest and saves results with timestamp: test_results_YYYY-MM-DD-HH:MM:SS.txt
+Every run is also recorded in reports/results.db (per-test outcome and duration).
+
+Options:
+    --changed   Run only the tests affected by files changed since the last run
+                (falls back to the full suite when the impact map is stale)
+    --report    Print slowest tests, duration trends, flaky tests and regressions
+    --watch     Keep pytest and the project preloaded and re-run affected tests on every change
+    --bench     Run the benchmarks in test/bench/ and check the PRD performance budgets
+                (a budget without a benchmark result fails too, unless --allow-unmeasured)
+    --profile   Profile every test (cProfile plus stack sampling) into reports/profile_*/
+                and summarize the hottest functions
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from impact_map import select_tests
+from results_db import ResultsDatabase, format_report, prune_reports
+from runner_paths import PROJECT_DIR, RUNNER_DIR, TEST_DIR
+from watch_runner import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, WarmRunner, watch
+
+REPORTS_DIR = TEST_DIR / "reports"
+BENCH_DIR = TEST_DIR / "bench"
+PRD_FILE = PROJECT_DIR / "PRD.md"
+IMPACT_MAP_FILE = REPORTS_DIR / "impact_map.json"
+RESULTS_DB_FILE = REPORTS_DIR / "results.db"
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Run the test suite with timestamped reports.")
+    parser.add_argument("--changed", action="store_true",
+                        help="run only tests affected by changes since the last run")
+    parser.add_argument("--report", action="store_true",
+                        help="report on recorded runs instead of running tests")
+    parser.add_argument("--keep-days", type=float, default=30,
+                        help="delete reports and profiles older than this many days (default: 30)")
+    parser.add_argument("--max-reports-mb", type=float, default=50,
+                        help="keep reports and profiles under this total size (default: 50)")
+    parser.add_argument("--watch", action="store_true",
+                        help="watch src/ and test/ and re-run affected tests in a warm process")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="seconds between change polls in watch mode")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help="quiet seconds to wait after a change before re-running")
+    parser.add_argument("--bench", action="store_true",
+                        help="run benchmarks and check the performance budgets in PRD.md")
+    parser.add_argument("--allow-unmeasured", action="store_true",
+                        help="with --bench, only warn about budgets whose benchmark reported nothing")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile every test and summarize the hottest functions")
+    return parser.parse_args(argv)
+
+
+def build_pytest_args(test_ids=None, mode="full", profile_dir=None):
+    """
+    Build the pytest arguments, recording the impact map and results as it runs.
+    
+    With profile_dir, tests are profiled instead: profiled durations would
+    distort the results database, and the impact tracer would distort the profile.
+    """
+    if profile_dir:
+        args = ["-v", "-p", "profiler", f"--profile-dir={profile_dir}"]
+    else:
+        args = ["-v",
+                "-p", "impact_map", f"--impact-map={IMPACT_MAP_FILE}",
+                "-p", "results_db", f"--results-db={RESULTS_DB_FILE}", f"--results-mode={mode}"]
+    args.extend(test_ids or ["test/"])
+    return args
+
+
+def build_pytest_command(test_ids=None, mode="full", profile_dir=None):
+    """Build the full pytest command line for a subprocess run."""
+    return [sys.executable, "-m", "pytest", *build_pytest_args(test_ids, mode, profile_dir)]
+
+
+def watch_tests(args):
+    """Watch mode: re-run the affected tests in a warm, forking runner."""
+    runner = WarmRunner(PROJECT_DIR)
+    runner.preload()
+
+    def next_run_args():
+        test_ids = select_tests(PROJECT_DIR, IMPACT_MAP_FILE)
+        if test_ids is not None and not test_ids:
+            return None
+        return build_pytest_args(test_ids, mode="watch")
+
+    watch(runner, next_run_args, args.poll_interval, args.debounce)
+    return 0
+
+
+def report_output_file():
+    """Return a timestamped report path that does not overwrite earlier runs."""
+    timestamp = datetime.now().strftime("%Y-%m-%d-%H:%M:%S")
+    output_file = REPORTS_DIR / f"test_results_{timestamp}.txt"
+    suffix = 1
+    while output_file.exists():
+        output_file = REPORTS_DIR / f"test_results_{timestamp}-{suffix}.txt"
+        suffix += 1
+    return output_file
+
+
+def pytest_env():
+    """Environment for the pytest subprocess (makes the runner's plugins importable)."""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(RUNNER_DIR), env.get("PYTHONPATH")]))
+    return env
+
+
+def check_performance_budgets(allow_unmeasured=False):
+    """Run the benchmarks, save their results and check them against PRD.md budgets."""
+    sys.path.insert(0, str(RUNNER_DIR / "bench"))
+    from harness import check_budgets, format_checks, load_budgets, run_benchmarks
+
+    print(f"Running benchmarks in {BENCH_DIR}")
+    results = run_benchmarks(BENCH_DIR)
+
+    REPORTS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y-%m-%d-%H:%M:%S")
+    output_file = REPORTS_DIR / f"bench_results_{timestamp}.json"
+    output_file.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+    budgets = load_budgets(PRD_FILE)
+    if not budgets:
+        print(f"No perf_budgets found in {PRD_FILE}; benchmark results saved to: {output_file}")
+        return 0
+
+    checks = check_budgets(results, budgets)
+    print(format_checks(checks))
+    print(f"\nBenchmark results saved to: {output_file}")
+
+    failed = [check for check in checks if check[2] == "fail"]
+    unmeasured = [check for check in checks if check[2] == "not measured"]
+    if failed:
+        print(f"Performance budgets exceeded: {len(failed)}")
+    if unmeasured:
+        if allow_unmeasured:
+            print(f"Warning: {len(unmeasured)} budget(s) not measured - wire up their benchmarks")
+        else:
+            print(f"Performance budgets not measured: {len(unmeasured)} - wire up their benchmarks"
+                  " (or pass --allow-unmeasured)")
+    if failed or (unmeasured and not allow_unmeasured):
+        return 1
+    print("All measured performance budgets met" if unmeasured else "All performance budgets met")
+    return 0
+
+
+def run_tests(argv=None):
+    """Run pytest with timestamped output file."""
+    args = parse_args(argv)
+
+    if args.report:
+        db = ResultsDatabase(RESULTS_DB_FILE)
+        try:
+            print(format_report(db))
+        finally:
+            db.close()
+        return 0
+
+    if args.watch:
+        return watch_tests(args)
+
+    # Create reports directory if it doesn't exist
+    REPORTS_DIR.mkdir(exist_ok=True)
+    prune_reports(REPORTS_DIR, args.keep_days, args.max_reports_mb)
+
+    if args.bench:
+        return check_performance_budgets(args.allow_unmeasured)
+
+    test_ids = None
+    if args.changed:
+        test_ids = select_tests(PROJECT_DIR, IMPACT_MAP_FILE)
+        if test_ids is None:
+            print("Impact map missing or stale - running the full suite")
+        elif not test_ids:
+            print("No tests affected by changes since the last run")
+            return 0
+        else:
+            print(f"Impact analysis selected {len(test_ids)} affected test(s)")
+
+    # Generate output filename with timestamp
+    output_file = report_output_file()
+
+    # Profiles go next to the text report, under the same timestamp
+    profile_dir = None
+    if args.profile:
+        profile_dir = REPORTS_DIR / output_file.stem.replace("test_results_", "profile_", 1)
+    
+    # Run pytest with verbose output
+    cmd = build_pytest_command(test_ids, mode="changed" if test_ids else "full", profile_dir=profile_dir)
+
+    print(f"Running tests and saving results to: {output_file}")
+
+    try:
+        # Run tests and capture output
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            cwd=PROJECT_DIR,
+            env=pytest_env()
+        )
+
+        # Write output to timestamped file
+        output_file.write_text(result.stdout + result.stderr)
+
+        # Print output to console
+        print(result.stdout)
+        if result.stderr:
+            print(result.stderr, file=sys.stderr)
+
+        print(f"\nTest results saved to: {output_file}")
+        return result.returncode
+
+    except Exception as e:
+        print(f"Error running tests: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(run_tests())
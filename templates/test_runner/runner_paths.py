@@ -0,0 +1,18 @@
+"""
+Runner Paths
+Locates the project the test runner works on.
+
+The runner files normally live in the project's test/ directory (the project
+wizard copies them there), so the project is their parent directory. A
+project that runs them from a shared checkout instead, like
+examples/calculator with templates/test_runner/, sets RUNNER_PROJECT_DIR.
+"""
+
+import os
+from pathlib import Path
+
+# Directory holding the runner, its pytest plugins and bench/harness.py
+RUNNER_DIR = Path(__file__).resolve().parent
+
+PROJECT_DIR = Path(os.environ.get("RUNNER_PROJECT_DIR") or RUNNER_DIR.parent).resolve()
+TEST_DIR = PROJECT_DIR / "test"
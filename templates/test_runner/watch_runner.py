@@ -0,0 +1,207 @@
+"""
+Warm Watch Runner
+Keeps pytest and the project modules preloaded and forks a child per test run.
+
+A cold ``run_tests.py`` invocation pays for interpreter start-up plus the pytest
+and project imports (with their GUI toolkits, numerical libraries, ...) on every
+run. The WarmRunner pays that once: the parent process imports everything up
+front and forks a fresh child for each run, so each run starts from an isolated
+copy of an already-warm interpreter. Project modules under src/ are re-imported
+in the parent whenever their files change, so children never see stale code;
+the third-party modules they import stay loaded. Test modules and conftest are
+imported by pytest inside the child. Helpers and plugins that the parent
+imported itself (impact_map, results_db, ...) are evicted from sys.modules
+whenever test/ or the runner's own directory changes, so children load them
+from disk again as well.
+
+Forking requires a POSIX platform; elsewhere runs fall back to a cold subprocess.
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Imported up front besides the project modules (which pull in their own dependencies)
+HEAVY_MODULES = ("pytest",)
+
+# Directory of the runner and its plugins: test/, or a shared checkout
+RUNNER_DIR = Path(__file__).resolve().parent
+
+# Seconds between polls of the watched directories, and quiet time before a run
+DEFAULT_POLL_INTERVAL = 0.25
+DEFAULT_DEBOUNCE = 0.3
+
+
+def snapshot_mtimes(directories: Iterable[Path]) -> Dict[str, int]:
+    """Return {path: mtime_ns} for every Python file under the given directories."""
+    mtimes = {}
+    for directory in directories:
+        for path in directory.rglob("*.py"):
+            if "reports" in path.parts:
+                continue
+            try:
+                mtimes[str(path)] = path.stat().st_mtime_ns
+            except OSError:
+                continue
+    return mtimes
+
+
+class WarmRunner:
+    """Pre-imports heavy modules once and runs pytest in forked children."""
+
+    def __init__(self, project_dir: Path):
+        """Initialize the runner for a project with src/ and test/ directories."""
+        self.project_dir = Path(project_dir).resolve()
+        self.src_dir = self.project_dir / "src"
+        self.test_dir = self.project_dir / "test"
+        # Where test helpers and the runner's plugins live
+        self.helper_dirs = [self.test_dir]
+        if not RUNNER_DIR.is_relative_to(self.test_dir):
+            self.helper_dirs.append(RUNNER_DIR)
+        self.can_fork = hasattr(os, "fork")
+        self._project_mtimes: Dict[str, int] = {}
+        self._test_mtimes = snapshot_mtimes(self.helper_dirs)
+
+    def preload(self) -> None:
+        """Import pytest and the project modules (and so their dependencies)."""
+        for name in HEAVY_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+        for path in (str(self.src_dir), str(self.project_dir)):
+            if path not in sys.path:
+                sys.path.insert(0, path)
+        self._import_project_modules()
+
+    def _project_module_names(self) -> List[str]:
+        """Names under which tests and sources import the project modules."""
+        names = []
+        for path in sorted(self.src_dir.glob("*.py")):
+            if path.stem in ("main", "__init__"):
+                continue
+            names.extend([path.stem, f"src.{path.stem}"])
+        return names
+
+    def _import_project_modules(self) -> None:
+        """(Re-)import the project modules, tolerating broken sources."""
+        for name in self._project_module_names():
+            try:
+                importlib.import_module(name)
+            except Exception:
+                # Leave it unimported; pytest in the child reports the error
+                continue
+        self._project_mtimes = snapshot_mtimes([self.src_dir])
+
+    def _evict_modules(self, directory: Path) -> None:
+        """Remove the modules loaded from files under directory from sys.modules."""
+        root = str(directory) + os.sep
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, "__file__", None) or ""
+            # The running script and this module stay: evicting them reloads nothing
+            if module_file.startswith(root) and name != "__main__" and module_file != __file__:
+                del sys.modules[name]
+
+    def refresh(self) -> bool:
+        """
+        Re-import the project modules if any source changed, and evict test
+        helpers and plugins if anything in their directories changed; True if
+        either did.
+        """
+        src_changed = snapshot_mtimes([self.src_dir]) != self._project_mtimes
+        test_mtimes = snapshot_mtimes(self.helper_dirs)
+        test_changed = test_mtimes != self._test_mtimes
+        if test_changed:
+            # The children import them again, e.g. with "-p results_db"
+            for directory in self.helper_dirs:
+                self._evict_modules(directory)
+            self._test_mtimes = test_mtimes
+        if src_changed:
+            # Evict all of them: modules hold references to each other's classes
+            self._evict_modules(self.src_dir)
+            sys.modules.pop("src", None)
+        if src_changed or test_changed:
+            importlib.invalidate_caches()
+        if src_changed:
+            self._import_project_modules()
+        return src_changed or test_changed
+
+    def run(self, pytest_args: List[str], stdout_fd: Optional[int] = None) -> int:
+        """Run pytest with the given arguments in a forked child; return its exit code."""
+        self.refresh()
+        if not self.can_fork:
+            return self._run_cold(pytest_args, stdout_fd)
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                if stdout_fd is not None:
+                    os.dup2(stdout_fd, 1)
+                os.chdir(self.project_dir)
+                import pytest
+                code = int(pytest.main(pytest_args))
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status)
+
+    def _run_cold(self, pytest_args: List[str], stdout_fd: Optional[int]) -> int:
+        """Fallback for platforms without fork: run pytest in a fresh interpreter."""
+        return subprocess.run(
+            [sys.executable, "-m", "pytest", *pytest_args],
+            cwd=self.project_dir, stdout=stdout_fd
+        ).returncode
+
+
+def watch(runner: WarmRunner, build_args: Callable[[], Optional[List[str]]],
+          poll_interval: float = DEFAULT_POLL_INTERVAL,
+          debounce: float = DEFAULT_DEBOUNCE) -> None:
+    """
+    Run once, then re-run whenever src/, test/ or the runner's own files
+    change, until interrupted.
+
+    build_args returns the pytest arguments for the next run, or None when
+    there is nothing to run. Bursts of changes (e.g. an editor saving several
+    files) are coalesced: a run starts once nothing changed for debounce seconds.
+    """
+    directories = [runner.src_dir, *runner.helper_dirs]
+    seen = snapshot_mtimes(directories)
+
+    def run_once():
+        args = build_args()
+        if args is None:
+            print("No tests affected by the change")
+            return
+        start = time.perf_counter()
+        code = runner.run(args)
+        print(f"\n[watch] exit code {code} in {time.perf_counter() - start:.2f}s"
+              f" - waiting for changes (Ctrl-C to stop)")
+
+    run_once()
+    try:
+        while True:
+            time.sleep(poll_interval)
+            current = snapshot_mtimes(directories)
+            if current == seen:
+                continue
+            # Debounce: wait until the tree has been quiet for a while
+            while True:
+                time.sleep(debounce)
+                settled = snapshot_mtimes(directories)
+                if settled == current:
+                    break
+                current = settled
+            seen = current
+            run_once()
+    except KeyboardInterrupt:
+        print("\n[watch] stopped")
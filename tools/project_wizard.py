@@ -6,6 +6,7 @@ Interactive tool to create new projects with appropriate templates and tech stac
 
 import os
 import sys
+import json
 import shutil
 import yaml
 from pathlib import Path
@@ -20,6 +21,9 @@ class ProjectWizard:
         self.framework_path = Path(__file__).parent.parent
         self.templates_path = self.framework_path / "templates" / "application_types"
         self.tech_stacks_path = self.framework_path / "tech_stacks"
+        self.performance_path = self.framework_path / "templates" / "performance"
+        # Shared test runner (with benchmark/budget hook) copied into new projects
+        self.runner_source_path = self.framework_path / "templates" / "test_runner"
         
     def run(self) -> None:
         """Run the interactive project wizard."""
@@ -36,6 +40,7 @@ class ProjectWizard:
         self._create_project_structure(project_path)
         self._generate_prd(project_path, project_name, app_type)
         self._setup_tech_stack(project_path, tech_stack)
+        self._setup_performance_scaffolding(project_path, app_type, tech_stack)
         self._create_framework_link(project_path)
         
         print(f"\n✅ Project '{project_name}' created successfully!")
@@ -43,6 +48,7 @@ class ProjectWizard:
         print(f"\n🎯 Next steps:")
         print(f"1. cd {project_path}")
         print(f"2. Complete the PRD.md file with your specific requirements")
+        print(f"   (including the Performance Budgets section checked by test/run_tests.py --bench)")
         print(f"3. Run: python -c 'import sys; sys.path.append(\"{self.framework_path}\"); from core.development_guide import start_development'")
         
     def _get_project_name(self) -> str:
@@ -206,6 +212,73 @@ class ProjectWizard:
             
             print(f"📦 Created requirements.txt with {len(dependencies)} dependencies")
     
+    def _setup_performance_scaffolding(self, project_path: Path, app_type: str,
+                                       tech_stack: Optional[Dict]) -> None:
+        """Emit the benchmark harness, starter benchmarks and PRD performance budgets."""
+        test_path = project_path / "deliverables" / "test"
+        bench_path = test_path / "bench"
+        bench_path.mkdir(parents=True, exist_ok=True)
+        
+        # Test runner with the --bench budget hook, its plugins and the benchmark harness
+        for source in sorted(self.runner_source_path.rglob("*.py")):
+            if "__pycache__" in source.parts:
+                continue
+            target = test_path / source.relative_to(self.runner_source_path)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, target)
+        
+        # Starter benchmarks for the application type
+        bench_template = self.performance_path / f"{app_type}_bench.py"
+        bench_file = bench_path / f"bench_{app_type}.py"
+        if bench_template.exists() and not bench_file.exists():
+            shutil.copyfile(bench_template, bench_file)
+        
+        budgets = self._get_performance_budgets(app_type, tech_stack)
+        self._write_performance_budgets(project_path / "deliverables" / "PRD.md", budgets)
+        
+        print(f"⏱️  Created benchmark harness with {len(budgets)} performance budgets: {bench_path}")
+    
+    def _get_performance_budgets(self, app_type: str, tech_stack: Optional[Dict]) -> List[Dict]:
+        """Merge application-type default budgets with tech stack overrides."""
+        budgets_file = self.performance_path / "budgets.yaml"
+        try:
+            with open(budgets_file, 'r') as f:
+                defaults = yaml.safe_load(f) or {}
+        except Exception as e:
+            print(f"⚠️  Error loading {budgets_file}: {e}")
+            defaults = {}
+        
+        budgets = {(b['benchmark'], b['metric']): dict(b) for b in defaults.get(app_type, [])}
+        known_benchmarks = {benchmark for benchmark, _ in budgets}
+        
+        # Tech stack budgets override per benchmark/metric; stacks shared between
+        # application types only apply to benchmarks this type actually has
+        for budget in (tech_stack or {}).get('performance_budgets', []):
+            if budget['benchmark'] in known_benchmarks:
+                budgets[(budget['benchmark'], budget['metric'])] = dict(budget)
+        
+        return list(budgets.values())
+    
+    def _write_performance_budgets(self, prd_path: Path, budgets: List[Dict]) -> None:
+        """Fill the machine-readable perf_budgets block in the PRD."""
+        lines = ",\n".join(f"    {json.dumps(budget)}" for budget in budgets)
+        block = '{\n  "perf_budgets": [\n' + lines + '\n  ]\n}'
+        
+        if not prd_path.exists():
+            return
+        
+        with open(prd_path, 'r') as f:
+            content = f.read()
+        
+        if "{PERF_BUDGETS}" in content:
+            content = content.replace("{PERF_BUDGETS}", block)
+        else:
+            content += f"\n\n## Performance Budgets\n\n```json\n{block}\n```\n"
+        
+        with open(prd_path, 'w') as f:
+            f.write(content)
+    
     def _create_framework_link(self, project_path: Path) -> None:
         """Create link to framework for development guidance."""
         claude_md_path = project_path / "CLAUDE.md"
@@ -223,6 +296,9 @@ This project uses the Claude Code Automation Framework for systematic developmen
 2. Use TodoWrite to plan implementation tasks
 3. Follow the framework development workflow
 4. Run tests with: python deliverables/test/run_tests.py
+5. Check performance budgets with: python deliverables/test/run_tests.py --bench
+   (budgets whose benchmark reports nothing fail until it is implemented;
+   pass --allow-unmeasured meanwhile)
 
 For detailed guidance, see the framework development guide.
 """